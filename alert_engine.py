@@ -0,0 +1,156 @@
+"""
+스트리밍 이상 징후 탐지 엔진
+
+- 시리즈(가격 변화율, Fear & Greed, BTC 활성 주소 등)별로 롤링 통계를 O(1)로 갱신
+    - EWMA 평균/분산 → 최근 흐름 대비 z-score (알림 기준)
+    - Welford 평균/분산 → 전체 히스토리 대비 z-score (참고값)
+- 과거 데이터를 다시 훑지 않고, 새 포인트가 들어올 때마다 상태만 갱신
+- update_many() 는 numpy 로 수천 개 시리즈를 한 번에 갱신
+
+Streamlit 에 의존하지 않으므로 benchmarks/ 에서도 그대로 import 해서 사용한다.
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Alert:
+    key: str
+    ts: float
+    value: float
+    z_ewma: float
+    z_welford: float
+
+
+class StreamingAnomalyDetector:
+    """
+    key 별 롤링 통계를 보관하는 탐지기.
+
+    - alpha: EWMA 가중치 (클수록 최근 값에 민감)
+    - z_threshold: |EWMA z-score| 가 이 값 이상이면 알림
+    - warmup: 이 개수만큼 포인트가 쌓이기 전에는 알림을 내지 않음
+    - 같은 key 에 대해 ts 가 이전보다 크지 않은 포인트는 무시 (rerun 중복 방지)
+    """
+
+    def __init__(self, alpha=0.1, z_threshold=3.0, warmup=10, max_alerts=200, capacity=1024):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+
+        self._slots = {}
+        self._keys = []
+        self._alloc(capacity)
+        self.alerts = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+
+    # -------- 내부 상태 (시리즈별 1칸씩) --------
+    def _alloc(self, capacity):
+        self.n = np.zeros(capacity, dtype=np.int64)
+        self.last_ts = np.full(capacity, -np.inf)
+        self.ew_mean = np.zeros(capacity)
+        self.ew_var = np.zeros(capacity)
+        self.w_mean = np.zeros(capacity)
+        self.w_m2 = np.zeros(capacity)
+
+    def _grow(self, needed):
+        capacity = len(self.n)
+        while capacity < needed:
+            capacity *= 2
+        for name in ["n", "last_ts", "ew_mean", "ew_var", "w_mean", "w_m2"]:
+            old = getattr(self, name)
+            new = np.full(capacity, -np.inf) if name == "last_ts" else np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _slot(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            if slot >= len(self.n):
+                self._grow(slot + 1)
+            self._slots[key] = slot
+            self._keys.append(key)
+        return slot
+
+    # -------- 갱신 --------
+    def update(self, key, value, ts):
+        """포인트 1개 반영. 이상 징후면 Alert 반환."""
+        alerts = self.update_many([key], [value], ts)
+        return alerts[0] if alerts else None
+
+    def update_many(self, keys, values, ts):
+        """
+        서로 다른 key 들의 포인트를 한 번에 반영 (keys 는 중복 없어야 함).
+        ts 는 스칼라 또는 keys 와 같은 길이의 배열.
+        """
+        with self._lock:
+            slots = np.fromiter((self._slot(k) for k in keys), dtype=np.int64, count=len(keys))
+            x = np.asarray(values, dtype=np.float64)
+            t = np.broadcast_to(np.asarray(ts, dtype=np.float64), x.shape)
+
+            fresh = (t > self.last_ts[slots]) & np.isfinite(x)
+            if not fresh.any():
+                return []
+            slots, x, t = slots[fresh], x[fresh], t[fresh]
+
+            n = self.n[slots]
+            first = n == 0
+
+            # 갱신 전 통계 기준 z-score
+            ew_mean, ew_var = self.ew_mean[slots], self.ew_var[slots]
+            w_mean, w_m2 = self.w_mean[slots], self.w_m2[slots]
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z_ewma = np.where(ew_var > 0, (x - ew_mean) / np.sqrt(ew_var), 0.0)
+                w_std = np.sqrt(w_m2 / np.maximum(n - 1, 1))
+                z_welford = np.where(w_std > 0, (x - w_mean) / w_std, 0.0)
+
+            # EWMA 평균/분산
+            diff = x - ew_mean
+            incr = self.alpha * diff
+            self.ew_mean[slots] = np.where(first, x, ew_mean + incr)
+            self.ew_var[slots] = np.where(first, 0.0, (1 - self.alpha) * (ew_var + diff * incr))
+
+            # Welford 평균/분산
+            n_new = n + 1
+            delta = x - w_mean
+            w_mean_new = w_mean + delta / n_new
+            self.w_mean[slots] = w_mean_new
+            self.w_m2[slots] = w_m2 + delta * (x - w_mean_new)
+
+            self.n[slots] = n_new
+            self.last_ts[slots] = t
+
+            hit = (n >= self.warmup) & (np.abs(z_ewma) >= self.z_threshold)
+            new_alerts = [
+                Alert(self._keys[s], float(tt), float(v), float(ze), float(zw))
+                for s, tt, v, ze, zw in zip(
+                    slots[hit], t[hit], x[hit], z_ewma[hit], z_welford[hit]
+                )
+            ]
+            self.alerts.extend(new_alerts)
+            return new_alerts
+
+    # -------- 조회 --------
+    def recent_alerts(self, limit=10):
+        with self._lock:
+            return list(self.alerts)[-limit:][::-1]
+
+    def stats(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        n = int(self.n[slot])
+        return {
+            "n": n,
+            "ewma": float(self.ew_mean[slot]),
+            "ewma_std": float(np.sqrt(self.ew_var[slot])),
+            "mean": float(self.w_mean[slot]),
+            "std": float(np.sqrt(self.w_m2[slot] / max(n - 1, 1))),
+        }
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,83 @@
+"""
+알림 엔진 처리량 벤치마크
+
+    python benchmarks/bench_alerts.py --series 5000 --ticks 500
+
+- 시리즈 N개에 정규분포 랜덤워크 포인트를 tick 단위로 흘려보내며
+  update_many()(배치) / update()(단건) 처리량을 측정
+- 일부 포인트에 스파이크를 심어서 탐지 개수도 함께 출력
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert_engine import StreamingAnomalyDetector  # noqa: E402
+
+
+def make_data(series, ticks, spike_rate, seed=42):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(0, 1, size=(ticks, series)).cumsum(axis=0) * 0.1 + rng.normal(0, 1, size=(ticks, series))
+    spikes = rng.random((ticks, series)) < spike_rate
+    spikes[:20] = False  # warmup 구간 제외
+    data[spikes] += rng.choice([-1, 1], size=spikes.sum()) * 12
+    return data, spikes
+
+
+def new_engine():
+    return StreamingAnomalyDetector(alpha=0.05, z_threshold=5.0, warmup=20)
+
+
+def bench_batch(data, keys):
+    engine = new_engine()
+    alerts = []
+    start = time.perf_counter()
+    for t, row in enumerate(data):
+        alerts += engine.update_many(keys, row, float(t))
+    elapsed = time.perf_counter() - start
+    return elapsed, alerts
+
+
+def bench_single(data, keys):
+    engine = new_engine()
+    start = time.perf_counter()
+    for t, row in enumerate(data):
+        for key, value in zip(keys, row):
+            engine.update(key, value, float(t))
+    elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--spike-rate", type=float, default=0.0005)
+    parser.add_argument("--single-ticks", type=int, default=20,
+                        help="단건 update() 측정에 쓸 tick 수 (느려서 일부만)")
+    args = parser.parse_args()
+
+    data, spikes = make_data(args.series, args.ticks, args.spike_rate)
+    keys = [f"series-{i}" for i in range(args.series)]
+    points = args.series * args.ticks
+
+    elapsed, alerts = bench_batch(data, keys)
+    hits = sum(spikes[int(a.ts), int(a.key.rsplit("-", 1)[1])] for a in alerts)
+    print(f"[batch ] {args.series:,} series x {args.ticks:,} ticks = {points:,} points")
+    print(f"         {elapsed:.3f}s  ->  {points / elapsed:,.0f} points/s"
+          f"  ({elapsed / args.ticks * 1000:.2f} ms/tick)")
+    print(f"         injected spikes {spikes.sum():,} / alerts {len(alerts):,}"
+          f" (spike 적중 {hits:,})")
+
+    single = data[:args.single_ticks]
+    elapsed = bench_single(single, keys)
+    single_points = single.size
+    print(f"[single] {single_points:,} points  {elapsed:.3f}s  ->  {single_points / elapsed:,.0f} points/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+HTTP 전송 계층 벤치마크 (요청 1건당 비용)
+
+    python benchmarks/bench_http.py --requests 200 --latency-ms 0
+    python benchmarks/bench_http.py --base-url https://api.coingecko.com/api/v3 --requests 10
+
+- 같은 URL 을 3가지 방식으로 반복 호출해서 요청당 평균/p50 시간 비교
+    - bare    : 매번 requests.get + r.json()   (기존 로더 방식, 매번 새 커넥션)
+    - session : 공유 세션(keep-alive 풀) + r.json()
+    - pooled  : 공유 세션 + orjson 디코딩      (http_client.get_json)
+- 기본은 loadtest/stub_server.py 를 띄워서 측정 (/coins/markets 250개, /coins/categories)
+    - 스텁은 평문 HTTP 라 TLS 핸드셰이크 절약분은 빠져 있음 → 실제 API 는 --base-url 로 측정
+- JSON 디코딩만 따로 (stdlib json vs orjson), 압축 전/후 전송 바이트도 출력
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "loadtest"))
+
+import http_client  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+ENDPOINTS = {
+    "markets": "/coins/markets?vs_currency=usd&per_page=250&page=1",
+    "categories": "/coins/categories",
+}
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_transport(url, n):
+    bare = lambda: requests.get(url, timeout=10).json()  # noqa: E731
+    s = http_client.make_session()
+    session = lambda: s.get(url, timeout=10).json()  # noqa: E731
+    pooled = lambda: http_client.get_json(url, http=s)  # noqa: E731
+
+    s.get(url, timeout=10)  # 커넥션 미리 열기 (첫 핸드셰이크는 공통 비용)
+    return {name: timed(fn, n) for name, fn in [("bare", bare), ("session", session), ("pooled", pooled)]}
+
+
+def bench_decode(content, n):
+    out = {"json": timed(lambda: json.loads(content), n)}
+    if http_client.orjson is not None:
+        out["orjson"] = timed(lambda: http_client.decode_json(content), n)
+    return out
+
+
+def wire_bytes(url, encoding):
+    r = requests.get(url, headers={"Accept-Encoding": encoding}, stream=True, timeout=10)
+    return len(r.raw.read(decode_content=False))
+
+
+def report(title, results):
+    base = statistics.mean(results[next(iter(results))])
+    print(f"  {title:<10}{'mean (ms)':>11}{'p50 (ms)':>10}{'speedup':>9}")
+    for name, samples in results.items():
+        mean = statistics.mean(samples)
+        print(f"    {name:<8}{mean * 1000:>11.3f}{statistics.median(samples) * 1000:>10.3f}"
+              f"{base / mean:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="방식별 요청 수")
+    parser.add_argument("--decode-loops", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0, help="스텁 응답 지연")
+    parser.add_argument("--base-url", default=None,
+                        help="실제 CoinGecko 주소로 측정 (예: https://api.coingecko.com/api/v3)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = start_stub_server(latency_ms=args.latency_ms, jitter_ms=0)
+        base_url = f"{server.base_url}/coingecko"
+
+    print(f"base={base_url} requests={args.requests} "
+          f"orjson={'yes' if http_client.orjson else 'no'} accept-encoding={http_client.ACCEPT_ENCODING}")
+
+    for name, path in ENDPOINTS.items():
+        url = base_url + path
+        content = requests.get(url, timeout=10).content
+        raw, packed = wire_bytes(url, "identity"), wire_bytes(url, http_client.ACCEPT_ENCODING)
+        print(f"\n[{name}] {len(content):,} bytes JSON · 전송 {raw:,} → {packed:,} bytes "
+              f"({packed / max(raw, 1):.0%})")
+        report("request", bench_transport(url, args.requests))
+        report("decode", bench_decode(content, args.decode_loops))
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+뉴스 벡터 검색 지연 벤치마크
+
+    python benchmarks/bench_vectors.py --sizes 500,2000,10000,50000 --queries 200
+
+- 인덱스 크기별로 군집형 임베딩(MiniLM 과 같은 384차원, 주제 중심 + 잡음)을 넣고 쿼리 1건당 지연 측정
+    (완전 랜덤 벡터는 HNSW 최악 조건이라 실제 뉴스 임베딩보다 recall 이 크게 낮게 나옴)
+    - exact : float16 블록 정확 검색 (hnswlib 없을 때 / ANN_MIN_ITEMS 미만)
+    - ann   : hnswlib HNSW (설치돼 있을 때만, 첫 쿼리의 인덱스 구성 시간은 따로 출력)
+- ANN 결과는 정확 검색 top-k 와 겹치는 비율(recall@k)도 출력
+- prune : 보존 기간 정리처럼 가장 오래된 --prune 비율을 지운 뒤의 정리 시간 / 쿼리 지연
+          (HNSW 는 mark_deleted 만 하므로 재구성 없이 바로 검색)
+- .npz 저장/로드 시간도 함께 출력 (임베딩 추가/정리 때마다 저장)
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_vectors import ANN_MIN_ITEMS, NewsVectorIndex, hnswlib  # noqa: E402
+
+
+def embeddings(rng, n, dim, topics=200, noise=0.6):
+    centers = np.random.default_rng(1).normal(size=(topics, dim))  # 모든 크기에서 같은 주제
+    return centers[rng.integers(0, topics, n)] + rng.normal(scale=noise, size=(n, dim))
+
+
+def build(directory, size, dim, rng):
+    store = NewsVectorIndex(directory)
+    store.add(np.arange(1, size + 1), embeddings(rng, size, dim), save=False)
+    return store
+
+
+def timed_queries(store, queries, k, use_ann):
+    samples, results = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(store.search(q, k=k, use_ann=use_ann))
+        samples.append(time.perf_counter() - start)
+    return samples, results
+
+
+def p(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500,2000,10000,50000")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--prune", type=float, default=0.05, help="정리할 비율 (오래된 순)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"dim={args.dim} k={args.k} queries={args.queries} "
+          f"hnswlib={'yes' if hnswlib else 'no'} (ANN_MIN_ITEMS={ANN_MIN_ITEMS})")
+    print(f"{'size':>8} {'mode':<6}{'p50 (ms)':>10}{'p99 (ms)':>10}{'extra':>28}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = build(tmp, size, args.dim, rng)
+            queries = embeddings(rng, args.queries, args.dim)
+
+            start = time.perf_counter()
+            store._save()
+            save_s = time.perf_counter() - start
+            start = time.perf_counter()
+            NewsVectorIndex(tmp)
+            load_s = time.perf_counter() - start
+
+            exact, exact_hits = timed_queries(store, queries, args.k, use_ann=False)
+            print(f"{size:>8} {'exact':<6}{p(exact, 50) * 1000:>10.2f}{p(exact, 99) * 1000:>10.2f}"
+                  f"{f'save {save_s * 1000:.0f}ms / load {load_s * 1000:.0f}ms':>28}")
+
+            if hnswlib is None:
+                continue
+            start = time.perf_counter()
+            store.search(queries[0], k=args.k, use_ann=True)  # 인덱스 구성
+            build_s = time.perf_counter() - start
+            ann, ann_hits = timed_queries(store, queries, args.k, use_ann=True)
+            recall = statistics.mean(
+                len({a for a, _ in h1} & {a for a, _ in h2}) / args.k
+                for h1, h2 in zip(exact_hits, ann_hits)
+            )
+            print(f"{size:>8} {'ann':<6}{p(ann, 50) * 1000:>10.2f}{p(ann, 99) * 1000:>10.2f}"
+                  f"{f'build {build_s:.2f}s / recall {recall:.2f}':>28}")
+
+            cut = int(size * args.prune)
+            start = time.perf_counter()
+            store.prune(store.ids[cut:])
+            prune_s = time.perf_counter() - start
+            pruned, pruned_hits = timed_queries(store, queries, args.k, use_ann=True)
+            stale = sum(a <= cut for h in pruned_hits for a, _ in h)
+            print(f"{size:>8} {'prune':<6}{p(pruned, 50) * 1000:>10.2f}{p(pruned, 99) * 1000:>10.2f}"
+                  f"{f'-{cut} in {prune_s * 1000:.0f}ms / stale {stale}':>28}")
+
+
+if __name__ == "__main__":
+    main()
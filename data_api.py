@@ -0,0 +1,239 @@
+"""
+읽기 전용 데이터 API (JSON / Arrow IPC)
+
+    GET /v1/                    → 공개 중인 데이터셋 목록 (etag, published_at, rows, 신선도)
+    GET /v1/<name>              → JSON (DataFrame 은 records 배열, dict 는 객체)
+    GET /v1/<name>.json
+    GET /v1/<name>.arrow        → Arrow IPC stream (pyarrow.ipc.open_stream 으로 읽기)
+
+- 대시보드가 이미 계산한 결과(load_* 캐시 값, 섹터 core_summary)를 publish() 로 넘겨두면
+  API 는 그 값만 직렬화해서 돌려준다 → 클라이언트가 아무리 폴링해도 업스트림 호출/재계산 없음
+    - 값은 대시보드 페이지가 렌더링될 때만 갱신 → 한 번도 렌더링되지 않은 데이터셋은 404,
+      아무도 페이지를 열지 않으면 로더 TTL 이 지나도 옛 값이 그대로 남는다
+    - 그래서 신선도를 같이 내보낸다 (publish 때 로더의 캐시 TTL 을 넘겨받음)
+        Last-Modified     : 데이터 조회 시각 (모르면 공개 시각)
+        X-Data-Age        : 조회 후 지난 초
+        X-Data-Expires-At : 조회 시각 + TTL. 이 시각이 지났으면 로더 캐시는 이미 만료된 옛 값
+      목록(/v1/)에도 fetched_at / age_s / ttl_s / expires_at / stale 로 포함
+- 같은 버전 값은 다시 publish 해도 무시, 직렬화 결과는 (버전, 포맷, 압축) 별로 1번만 생성
+- ETag / If-None-Match → 304, Accept-Encoding: gzip 지원
+
+Streamlit 에 의존하지 않는다. 서버는 shared_data_api() 로 프로세스당 1번만 기동
+(st.cache_resource 에 두면 "Clear caches" 후 새 인스턴스가 같은 포트를 다시 잡으려다 실패하고
+이전 서버는 옛 데이터를 계속 내보내므로, http_client.session() 처럼 모듈 전역으로 보관).
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+
+JSON_TYPE = "application/json; charset=utf-8"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+GZIP_MIN_BYTES = 1024
+
+_api = None
+_api_lock = threading.Lock()
+
+
+class _Dataset:
+    def __init__(self, name, obj, version, ttl=None, fetched_at=None):
+        self.name = name
+        self.obj = obj          # 원본 참조 유지 (id() 버전이 재사용되지 않도록)
+        self.version = version
+        self.published_at = time.time()
+        self.fetched_at = self.published_at if fetched_at is None else fetched_at
+        self.ttl = ttl
+        self.expires_at = None if ttl is None else self.fetched_at + ttl
+        self.etag = hashlib.sha1(
+            f"{name}|{version!r}|{self.published_at}".encode()
+        ).hexdigest()[:20]
+        self.rows = len(obj) if isinstance(obj, pd.DataFrame) else 1
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def body(self, fmt, gz):
+        with self._lock:
+            if (fmt, False) not in self._bodies:
+                self._bodies[(fmt, False)] = _encode(self.obj, fmt)
+            if gz and (fmt, True) not in self._bodies:
+                self._bodies[(fmt, True)] = gzip.compress(self._bodies[(fmt, False)], compresslevel=5)
+            return self._bodies[(fmt, gz)]
+
+    def freshness(self, now=None):
+        now = time.time() if now is None else now
+        return {
+            "fetched_at": formatdate(self.fetched_at, usegmt=True),
+            "age_s": max(0, int(now - self.fetched_at)),
+            "ttl_s": self.ttl,
+            "expires_at": None if self.expires_at is None else formatdate(self.expires_at, usegmt=True),
+            "stale": self.expires_at is not None and now > self.expires_at,
+        }
+
+
+def _encode(obj, fmt):
+    if fmt == "arrow":
+        if isinstance(obj, pd.DataFrame):
+            table = pa.Table.from_pandas(obj, preserve_index=False)
+        else:
+            table = pa.Table.from_pylist([obj])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if isinstance(obj, pd.DataFrame):
+        text = obj.to_json(orient="records", date_format="iso", force_ascii=False)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, default=str)
+    return text.encode("utf-8")
+
+
+class DataAPI:
+    """이름별 최신 결과를 보관하고 HTTP 로 내보내는 저장소"""
+
+    def __init__(self):
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self.server = None
+        self.error = None
+
+    def publish(self, name, obj, version=None, ttl=None, fetched_at=None):
+        """
+        name 으로 obj 공개. version 이 직전과 같으면 무시한다.
+        version 을 안 주면 객체 id 로 판단 (cache_resource 결과처럼 같은 객체가 재사용되는 경우)
+        ttl 은 obj 를 만든 로더의 캐시 TTL(초), fetched_at 은 조회 시각(epoch, 모르면 지금)
+        """
+        version = id(obj) if version is None else version
+        with self._lock:
+            current = self._datasets.get(name)
+            if current is not None and current.version == version:
+                return False
+            self._datasets[name] = _Dataset(name, obj, version, ttl, fetched_at)
+            return True
+
+    def get(self, name):
+        with self._lock:
+            return self._datasets.get(name)
+
+    def index(self):
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    "etag": ds.etag,
+                    "published_at": formatdate(ds.published_at, usegmt=True),
+                    "rows": ds.rows,
+                    **ds.freshness(now),
+                }
+                for name, ds in sorted(self._datasets.items())
+            }
+
+    # -------- HTTP 서버 --------
+    def serve(self, host="127.0.0.1", port=8601):
+        """백그라운드 스레드로 HTTP 서버 기동 (실패하면 error 에 사유 기록)"""
+        try:
+            server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            self.error = f"{host}:{port} 바인드 실패: {e}"
+            return None
+        server.daemon_threads = True
+        server.api = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.server = server
+        return server
+
+    @property
+    def url(self):
+        if self.server is None:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass  # 폴링 요청마다 로그 남기지 않음
+
+    def _send(self, status, ctype=None, body=b"", headers=None):
+        self.send_response(status)
+        if ctype:
+            self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, JSON_TYPE, json.dumps({"error": message}, ensure_ascii=False).encode())
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        api = self.server.api
+        path = self.path.split("?", 1)[0].rstrip("/")
+
+        if path == "/v1":
+            body = json.dumps(api.index(), ensure_ascii=False).encode()
+            self._send(200, JSON_TYPE, body, {"Cache-Control": "no-cache"})
+            return
+        if not path.startswith("/v1/"):
+            self._error(404, "not found")
+            return
+
+        name = path[len("/v1/"):]
+        fmt = "json"
+        for ext in ("json", "arrow"):
+            if name.endswith("." + ext):
+                name, fmt = name[: -len(ext) - 1], ext
+
+        ds = api.get(name)
+        if ds is None:
+            self._error(404, f"unknown or not yet published dataset: {name}")
+            return
+
+        etag = f'"{ds.etag}-{fmt}"'
+        fresh = ds.freshness()
+        headers = {
+            "ETag": etag,
+            "Last-Modified": fresh["fetched_at"],
+            "X-Data-Age": str(fresh["age_s"]),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if fresh["expires_at"]:
+            headers["X-Data-Expires-At"] = fresh["expires_at"]
+        if etag in self.headers.get("If-None-Match", ""):
+            self._send(304, headers=headers)
+            return
+
+        gz = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = ds.body(fmt, False)
+        if gz and len(body) >= GZIP_MIN_BYTES:
+            body = ds.body(fmt, True)
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, JSON_TYPE if fmt == "json" else ARROW_TYPE, body, headers)
+
+
+def shared_data_api(host="127.0.0.1", port=None):
+    """프로세스 공용 DataAPI (처음 호출 시 생성, port 가 있으면 HTTP 서버도 기동)"""
+    global _api
+    if _api is None:
+        with _api_lock:
+            if _api is None:
+                api = DataAPI()
+                if port:
+                    api.serve(host, port)
+                _api = api
+    return _api
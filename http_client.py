@@ -0,0 +1,102 @@
+"""
+공용 HTTP 전송 계층
+
+- 프로세스 전체가 requests.Session 1개를 공유
+    - 호스트별 keep-alive 커넥션 풀 → 호출마다 TCP/TLS 핸드셰이크를 다시 하지 않음
+    - Accept-Encoding: gzip/deflate/br 압축 전송 (br 은 brotli 패키지가 있어야 해제 가능)
+- JSON 디코딩은 orjson 사용 (큰 /coins/categories, /coins/markets 응답)
+    - brotli / orjson 은 requirements.txt 에 포함, 설치 안 된 환경에서는 자동으로 빠짐
+- 429 응답은 Retry-After 만큼 기다렸다가 재시도
+
+Streamlit 스크립트는 rerun 마다 다시 실행되지만 import 된 모듈은 유지되므로
+세션도 모듈 전역으로 한 번만 만든다 (스냅샷 워커 스레드에서도 그대로 사용 가능).
+Streamlit 에 의존하지 않으므로 benchmarks/ 에서도 그대로 import 해서 사용한다.
+"""
+import json
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# orjson (빠른 JSON 디코더, requirements.txt) – 설치 안 된 환경에서는 표준 json 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+POOL_HOSTS = 16      # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 32    # 호스트당 최대 커넥션 수 (동시 세션/스레드 수 이상)
+MAX_RETRIES = 3
+USER_AGENT = "web3-chain-radar"
+
+# urllib3 가 해제할 수 있는 인코딩만 요청 (brotli/zstandard 는 설치돼 있을 때만 포함)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool_maxsize=POOL_MAXSIZE):
+    """keep-alive 커넥션 풀 + 압축 전송 설정을 한 새 세션"""
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "User-Agent": USER_AGENT})
+    return s
+
+
+def session():
+    """프로세스 공용 세션 (처음 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def decode_json(content):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def get(url, timeout=10, **kwargs):
+    return session().get(url, timeout=timeout, **kwargs)
+
+
+def retry_after(r, default):
+    """Retry-After 헤더(초 또는 HTTP-date)를 대기 초로 변환. 없거나 못 읽으면 default."""
+    value = r.headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:  # "-0000" 표기 → UTC
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - time.time())
+
+
+def get_json(url, timeout=10, max_retries=MAX_RETRIES, http=None):
+    """GET → JSON. 429 는 Retry-After 만큼 대기 후 재시도, 그 외 4xx/5xx 는 예외."""
+    http = http or session()
+    for attempt in range(max_retries):
+        r = http.get(url, timeout=timeout)
+        if r.status_code != 429:
+            r.raise_for_status()
+            return decode_json(r.content)
+        if attempt < max_retries - 1:  # 마지막 시도 뒤에는 기다리지 않고 바로 예외
+            time.sleep(min(retry_after(r, 2 ** attempt), 10))
+
+    r.raise_for_status()
@@ -0,0 +1,241 @@
+"""
+동시 세션 부하 테스트
+
+    python loadtest/run_loadtest.py --sessions 20 --iterations 3 --latency-ms 150 --rate-429 0.05
+
+- 추가 의존성: pip install websockets (앱 requirements.txt 에는 없음)
+- 로컬 스텁 서버(stub_server.py)를 띄우고, 외부 API 주소를 스텁으로 바꾼
+  `streamlit run` 워커 1개를 서브프로세스로 실행
+- 브라우저 대신 웹소켓(/_stcore/stream) 세션 N개를 동시에 열어서
+  ?page=home → news → sectors 순으로 스크립트 재실행을 요청하고 완료까지 시간 측정
+    - AppTest 는 런타임 전역 상태를 써서 한 프로세스 안 동시 실행이 안 되므로
+      실제 서버에 붙는 방식 사용 (캐시 공유 등 실제 워커와 같은 조건)
+    - --cold 를 주면 매 순회 시작 때 캐시를 비워서 TTL 만료 상황을 재현
+- 페이지별 p50/p99 지연 / 오류 수, 처리량(page/s), 업스트림 route 별 호출 수 출력
+    - 오류 = 처리 안 된 예외 + st.error 경고 (로더 실패를 앱이 잡아서 st.error 로 표시한 경우)
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+import websockets
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from stub_server import start_stub_server, stub_env  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(HERE), "streamlit_app.py")
+PAGES = ["home", "news", "sectors"]
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ===============================================
+# Streamlit 워커 실행
+# ===============================================
+def start_app(port, env, log_path):
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", APP_PATH,
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--server.address", "127.0.0.1",
+        "--server.enableXsrfProtection", "false",
+        "--server.enableCORS", "false",
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+    log = open(log_path, "w")
+    # 앱과 같은 폴더에서 실행 (watchlist.csv 등 상대 경로 설정 파일)
+    proc = subprocess.Popen(
+        cmd, env=env, cwd=os.path.dirname(APP_PATH), stdout=log, stderr=subprocess.STDOUT
+    )
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit 종료됨 (로그: {log_path})")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.3)
+    proc.terminate()
+    raise RuntimeError(f"streamlit 기동 시간 초과 (로그: {log_path})")
+
+
+# ===============================================
+# 세션 1개 = 웹소켓 1개
+# ===============================================
+async def run_page(ws, page, timeout):
+    """?page=... 로 재실행 요청 → script_finished 까지 대기. (소요 시간, 오류 메시지 목록)"""
+    msg = BackMsg()
+    msg.rerun_script.query_string = f"page={page}"
+    start = time.perf_counter()
+    await ws.send(msg.SerializeToString())
+
+    errors = []
+    async with asyncio.timeout(timeout):
+        while True:
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(await ws.recv())
+            kind = fmsg.WhichOneof("type")
+
+            if kind == "delta":
+                element = fmsg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors.append(element.exception.message)
+                elif element_type == "alert" and element.alert.format == Alert.ERROR:
+                    errors.append(element.alert.body)
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(fmsg.script_finished)
+                if status == "FINISHED_WITH_COMPILE_ERROR":
+                    errors.append(status)
+                if status != "FINISHED_EARLY_FOR_RERUN":
+                    break
+
+    return time.perf_counter() - start, errors
+
+
+async def run_session(session_id, url, args, pages, state, results):
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        try:
+            await run_page(ws, "home", args.timeout)  # 첫 렌더 (측정 제외)
+        finally:
+            state["warm"] += 1
+            if state["warm"] == args.sessions:
+                state["begin"]()
+        await state["ready"].wait()
+
+        for it in range(args.iterations):
+            if args.cold and session_id == 0:
+                clear = BackMsg()
+                clear.clear_cache = True
+                await ws.send(clear.SerializeToString())
+            for page in pages:
+                try:
+                    elapsed, errors = await run_page(ws, page, args.timeout)
+                except (TimeoutError, websockets.ConnectionClosed) as e:
+                    elapsed, errors = args.timeout, [repr(e)]
+                results[page].append(elapsed)
+                for error in errors:
+                    results["errors"].append((session_id, it, page, error))
+
+
+async def run_all(args, url, pages, server):
+    results = defaultdict(list)
+    state = {"warm": 0, "ready": asyncio.Event()}
+
+    def begin():
+        # 모든 세션의 첫 렌더가 끝난 시점부터 측정
+        state["warm_calls"] = server.stats()["calls"]
+        server.reset()
+        state["start"] = time.perf_counter()
+        state["ready"].set()
+
+    state["begin"] = begin
+
+    await asyncio.gather(*[
+        run_session(i, url, args, pages, state, results)
+        for i in range(args.sessions)
+    ])
+    state["wall"] = time.perf_counter() - state["start"]
+    return results, state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--fixtures", default=None, help="녹화된 업스트림 응답 폴더")
+    parser.add_argument("--timeout", type=float, default=120, help="페이지 1회 실행 제한(초)")
+    parser.add_argument("--cold", action="store_true", help="순회마다 캐시 초기화")
+    parser.add_argument("--port", type=int, default=0, help="streamlit 포트 (0 이면 자동)")
+    args = parser.parse_args()
+
+    pages = [p.strip() for p in args.pages.split(",") if p.strip()]
+
+    server = start_stub_server(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        fixtures=args.fixtures,
+    )
+    # 로컬 저장소(아카이브/인덱스)는 임시 폴더 사용
+    workdir = tempfile.mkdtemp(prefix="radar-loadtest-")
+    env = {**os.environ, **stub_env(server.base_url), "RADAR_DATA_DIR": workdir}
+
+    port = args.port or free_port()
+    log_path = os.path.join(workdir, "streamlit.log")
+    app = start_app(port, env, log_path)
+
+    print(f"stub {server.base_url} · app :{port} · sessions={args.sessions} "
+          f"iterations={args.iterations} pages={pages} "
+          f"latency={args.latency_ms}±{args.jitter_ms}ms 429={args.rate_429:.0%}")
+
+    try:
+        results, state = asyncio.run(
+            run_all(args, f"ws://127.0.0.1:{port}/_stcore/stream", pages, server)
+        )
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+
+    total = sum(len(results[p]) for p in pages)
+    print()
+    page_errors = defaultdict(int)
+    for _, _, page, _ in results["errors"]:
+        page_errors[page] += 1
+    print(f"{'page':<10}{'runs':>6}{'p50 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}{'errors':>8}")
+    for page in pages:
+        lat = results[page]
+        print(f"{page:<10}{len(lat):>6}{percentile(lat, 50):>10.2f}"
+              f"{percentile(lat, 99):>10.2f}{max(lat, default=float('nan')):>10.2f}"
+              f"{page_errors[page]:>8}")
+    print()
+    print(f"throughput : {total / state['wall']:.2f} page/s "
+          f"({total} page runs in {state['wall']:.1f}s, 첫 렌더 제외)")
+    print(f"errors     : {len(results['errors'])}")
+    for session_id, it, page, error in results["errors"][:10]:
+        print(f"  - session {session_id} iter {it} {page}: {error[:200]}")
+
+    warm, stats = state["warm_calls"], server.stats()
+    print()
+    print(f"{'upstream route':<28}{'warmup':>8}{'measured':>10}{'429':>6}")
+    for route in sorted(set(warm) | set(stats["calls"])):
+        print(f"  {route:<26}{warm.get(route, 0):>8}{stats['calls'].get(route, 0):>10}"
+              f"{stats['throttled'].get(route, 0):>6}")
+    print(f"\nstreamlit log: {log_path}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
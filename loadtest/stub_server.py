@@ -0,0 +1,332 @@
+"""
+업스트림 API 로컬 스텁 서버 (부하 테스트용)
+
+    python loadtest/stub_server.py --port 8765 --latency-ms 150 --rate-429 0.05
+
+앱이 호출하는 CoinGecko / Alternative.me / Blockchain.com / CryptoPanic /
+Cointelegraph RSS / Google News / 코인데스크 코리아 응답을 흉내낸다.
+
+- 경로 접두어로 서비스 구분: /coingecko, /alternative, /blockchain, /cryptopanic,
+  /cointelegraph, /googlenews, /coindesk
+- --fixtures 폴더에 녹화해 둔 응답 파일이 있으면 그대로 재생
+  (파일명은 route 이름, 예: coingecko_global.json, cointelegraph_rss.xml)
+- 응답마다 latency(+jitter) 지연, 일정 비율로 429 + Retry-After 응답
+- HTTP/1.1 keep-alive, Accept-Encoding 에 gzip 이 있으면 압축 응답 (실제 API 와 동일)
+- GET /__stats → route 별 호출 수(JSON), POST /__reset → 카운터 초기화
+
+앱 쪽은 stub_env(base_url) 의 환경변수로 주소를 바꿔서 연결한다.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORY_NAMES = [
+    "Artificial Intelligence (AI)", "AI Agents", "Layer 2 (L2)", "Rollups", "ZkSync Ecosystem",
+    "Decentralized Finance (DeFi)", "Decentralized Exchange (DEX)", "Lending/Borrowing",
+    "Yield Farming", "Liquid Staking", "NFT", "Collectibles", "Gaming (GameFi)", "Metaverse",
+    "Real World Assets (RWA)", "Tokenized Gold", "Smart Contract Platform", "Meme",
+    "Solana Ecosystem", "Polkadot Ecosystem", "Chainlink Ecosystem", "Oracle", "Privacy Coins",
+    "Storage", "Exchange-based Tokens",
+]
+N_COINS = 1500
+
+
+def stub_env(base_url):
+    """앱(streamlit_app.py)이 스텁 서버를 바라보게 하는 환경변수"""
+    return {
+        "RADAR_COINGECKO_API": f"{base_url}/coingecko",
+        "RADAR_ALTERNATIVE_API": f"{base_url}/alternative",
+        "RADAR_BLOCKCHAIN_API": f"{base_url}/blockchain",
+        "RADAR_CRYPTOPANIC_API": f"{base_url}/cryptopanic",
+        "RADAR_COINTELEGRAPH_RSS": f"{base_url}/cointelegraph/rss",
+        "RADAR_GOOGLE_NEWS": f"{base_url}/googlenews",
+        "RADAR_COINDESK_KO": f"{base_url}/coindesk/ko",
+    }
+
+
+# ===============================================
+# 가짜 응답 생성
+# ===============================================
+def _coin(i, rng):
+    return {
+        "id": f"coin-{i}",
+        "symbol": f"c{i}",
+        "name": f"Coin {i}",
+        "current_price": round(rng.uniform(0.001, 50000), 6),
+        "market_cap": rng.uniform(1e6, 1e11),
+        "price_change_percentage_24h": rng.gauss(0, 5),
+    }
+
+
+def _rss(title, items):
+    entries = "".join(
+        f"<item><title>{t}</title><link>{link}</link>"
+        f"<description>{desc}</description></item>"
+        for t, link, desc in items
+    )
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+        f"<title>{title}</title>{entries}</channel></rss>"
+    )
+
+
+def build_response(route, query, base_url, rng):
+    """route 이름 → (content_type, body)"""
+    now = time.time()
+
+    if route == "coingecko_simple_price":
+        ids = query.get("ids", [""])[0].split(",")
+        body = {
+            cid: {
+                "usd": rng.uniform(0.01, 50000),
+                "usd_24h_change": rng.gauss(0, 4),
+                "usd_market_cap": rng.uniform(1e6, 1e12),
+                "usd_24h_vol": rng.uniform(1e5, 1e10),
+            }
+            for cid in ids if cid
+        }
+    elif route == "coingecko_global":
+        body = {"data": {
+            "total_market_cap": {"usd": 2.5e12},
+            "total_volume": {"usd": 9.0e10},
+            "market_cap_percentage": {"btc": 54.2, "eth": 17.1},
+            "market_cap_change_percentage_24h_usd": rng.gauss(0, 2),
+            "active_cryptocurrencies": 14000,
+        }}
+    elif route == "coingecko_categories":
+        body = [
+            {
+                "id": f"cat-{i}",
+                "name": name,
+                "market_cap": rng.uniform(1e8, 5e11),
+                "market_cap_change_24h": rng.gauss(0, 3),
+            }
+            for i, name in enumerate(CATEGORY_NAMES)
+        ]
+    elif route == "coingecko_markets":
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["100"])[0])
+        category = query.get("category", [None])[0]
+        if category:
+            # 카테고리마다 고정된 코인 집합 (카테고리 간 중복 포함)
+            seed = int(category.split("-")[-1]) if category.split("-")[-1].isdigit() else 0
+            members = list(range(seed * 40, seed * 40 + 120))
+        else:
+            members = list(range(N_COINS))
+        chunk = members[(page - 1) * per_page: page * per_page]
+        body = [_coin(i, rng) for i in chunk]
+    elif route == "alternative_fng":
+        body = {"data": [
+            {
+                "value": str(rng.randint(10, 90)),
+                "value_classification": "Neutral",
+                "timestamp": str(int(now - d * 86400)),
+            }
+            for d in range(30)
+        ]}
+    elif route == "blockchain_active":
+        timespan = query.get("timespan", ["30days"])[0]
+        days = {"1year": 365, "3years": 365 * 3, "all": 365 * 16}.get(timespan, 30)
+        body = {"values": [
+            {"x": int(now - d * 86400), "y": rng.randint(700000, 900000)}
+            for d in range(days, 0, -1)
+        ]}
+    elif route == "cryptopanic_posts":
+        body = {"results": [
+            {
+                "title": f"Bitcoin market update #{i}",
+                "source": {"title": "CryptoPanic"},
+                "description": "Bitcoin and ether traded higher as ETF inflows continued. " * 3,
+            }
+            for i in range(20)
+        ]}
+    elif route == "cointelegraph_rss":
+        return "application/rss+xml", _rss("Cointelegraph", [
+            (f"Ethereum layer 2 news {i}", f"{base_url}/cointelegraph/news/{i}",
+             "Layer 2 rollups saw record activity this week. " * 4)
+            for i in range(10)
+        ])
+    elif route == "googlenews_rss":
+        return "application/rss+xml", _rss("Google News", [
+            (f"비트코인 시장 동향 {i}", f"{base_url}/googlenews/articles/{i}", "비트코인 시세")
+            for i in range(40)
+        ])
+    elif route == "googlenews_article":
+        text = "비트코인 가격이 상승했다. 이더리움도 강세를 보였다. 시장 참여자들은 ETF 자금 유입에 주목했다. " * 10
+        return "text/html; charset=utf-8", f"<html><body><article>{text}</article></body></html>"
+    elif route == "coindesk_ko":
+        heads = "".join(f"<h3>코인데스크 헤드라인 {i}</h3>" for i in range(15))
+        return "text/html; charset=utf-8", f"<html><body>{heads}</body></html>"
+    else:
+        return None
+
+    return "application/json", json.dumps(body)
+
+
+def route_of(path):
+    routes = [
+        ("/coingecko/simple/price", "coingecko_simple_price"),
+        ("/coingecko/global", "coingecko_global"),
+        ("/coingecko/coins/categories", "coingecko_categories"),
+        ("/coingecko/coins/markets", "coingecko_markets"),
+        ("/alternative/fng", "alternative_fng"),
+        ("/blockchain/charts/n-unique-addresses", "blockchain_active"),
+        ("/cryptopanic/posts", "cryptopanic_posts"),
+        ("/cointelegraph/rss", "cointelegraph_rss"),
+        ("/googlenews/rss/search", "googlenews_rss"),
+        ("/googlenews/articles/", "googlenews_article"),
+        ("/coindesk/ko", "coindesk_ko"),
+    ]
+    for prefix, name in routes:
+        if path.startswith(prefix):
+            return name
+    return None
+
+
+# ===============================================
+# 서버
+# ===============================================
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=100, jitter_ms=50, rate_429=0.0, fixtures=None, seed=0):
+        super().__init__(address, StubHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.fixtures = fixtures
+        self.rng = random.Random(seed)
+        self.calls = Counter()
+        self.throttled = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fixture(self, route):
+        if not self.fixtures:
+            return None
+        for ext, ctype in [(".json", "application/json"), (".xml", "application/rss+xml"),
+                           (".html", "text/html; charset=utf-8")]:
+            path = os.path.join(self.fixtures, route + ext)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return ctype, f.read()
+        return None
+
+    def stats(self):
+        with self.lock:
+            return {"calls": dict(self.calls), "throttled": dict(self.throttled)}
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.throttled.clear()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+    protocol_version = "HTTP/1.1"  # keep-alive (Content-Length 항상 전송)
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 delayed ACK 40ms 대기 방지
+
+    def log_message(self, format, *args):
+        pass  # 부하 테스트 중 로그 출력 생략
+
+    def _send(self, status, ctype, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        if len(data) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))  # keep-alive 연결 정리
+        if self.path == "/__reset":
+            self.server.reset()
+            self._send(200, "application/json", "{}")
+        else:
+            self._send(404, "text/plain", "not found")
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/__stats":
+            self._send(200, "application/json", json.dumps(self.server.stats()))
+            return
+
+        route = route_of(parsed.path)
+        if route is None:
+            self._send(404, "text/plain", "not found")
+            return
+
+        srv = self.server
+        with srv.lock:
+            srv.calls[route] += 1
+            throttle = srv.rng.random() < srv.rate_429
+            delay = max(0.0, srv.latency_ms + srv.rng.uniform(-srv.jitter_ms, srv.jitter_ms)) / 1000
+            if throttle:
+                srv.throttled[route] += 1
+        time.sleep(delay)
+
+        if throttle:
+            self._send(429, "application/json", '{"error": "rate limited"}', {"Retry-After": "1"})
+            return
+
+        with srv.lock:
+            rng = random.Random(srv.rng.random())
+        resp = srv.fixture(route) or build_response(route, parse_qs(parsed.query), srv.base_url, rng)
+        ctype, body = resp
+        self._send(200, ctype, body)
+
+
+def start_stub_server(host="127.0.0.1", port=0, **kwargs):
+    """백그라운드 스레드로 스텁 서버 시작 (port=0 이면 빈 포트 자동 할당)"""
+    server = StubServer((host, port), **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--fixtures", default=None)
+    args = parser.parse_args()
+
+    server = StubServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        fixtures=args.fixtures,
+    )
+    print(f"stub server on {server.base_url}")
+    print("앱 연결용 환경변수:")
+    for k, v in stub_env(server.base_url).items():
+        print(f"  export {k}={v}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
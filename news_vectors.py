@@ -0,0 +1,152 @@
+"""
+뉴스 임베딩 벡터 인덱스
+
+- L2 정규화한 임베딩을 float16 행렬로 보관 (코사인 유사도 = 내적)
+- 벡터 행렬과 article_id 배열은 .npz 파일 하나에 같이 저장 → os.replace 1번으로 교체
+  (둘이 따로 저장되다 중간에 죽어서 길이가 어긋나는 일이 없도록)
+- 검색: ANN_MIN_ITEMS 개 이상이면 hnswlib HNSW, 아니면 블록 단위 정확 검색
+    - 보존 기간 정리(prune)는 HNSW 에서 mark_deleted 만 하고, 빈 자리는 새 벡터가 재사용
+    - 삭제 누적이 ANN_REBUILD_RATIO 를 넘을 때만 다음 검색에서 인덱스 재구성
+
+Streamlit 에 의존하지 않으므로 benchmarks/ 에서도 그대로 import 해서 사용한다.
+"""
+import os
+import threading
+
+import numpy as np
+
+# hnswlib (근사 최근접 이웃 인덱스, requirements.txt) – 설치 실패 환경에서는 정확 검색으로 대체
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+ANN_MIN_ITEMS = 2000    # 이보다 적으면 정확 검색도 충분히 빠름 (benchmarks/bench_vectors.py)
+EXACT_BLOCK_ROWS = 8192
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 100  # 200 대비 구성 시간 절반, recall 차이 미미 (bench_vectors.py)
+HNSW_EF_SEARCH = 128        # 64 → 128 에서 recall@5 0.8 → 0.9+
+ANN_REBUILD_RATIO = 0.5  # 구성 이후 삭제 표시한 수 / 현재 크기 가 이 값을 넘으면 재구성
+
+
+class NewsVectorIndex:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, "news_vectors.npz")
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        self.ids = np.zeros(0, dtype=np.int64)
+
+        legacy = [os.path.join(directory, n) for n in ("news_vectors.npy", "news_vector_ids.npy")]
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                vectors, ids = data["vectors"], data["ids"]
+        elif all(os.path.exists(p) for p in legacy):
+            vectors, ids = (np.load(p) for p in legacy)  # 예전 형식 (.npy 2개)
+        else:
+            vectors, ids = self.vectors, self.ids
+
+        # 길이가 어긋난 파일은 버리고 비운 상태로 시작 (다음 임베딩 때 다시 채워짐)
+        if len(vectors) == len(ids):
+            self.vectors, self.ids = vectors, ids
+
+        self._pos = {int(a): i for i, a in enumerate(self.ids)}
+        self._ann = None
+        self._ann_deleted = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def max_id(self):
+        return int(self.ids.max()) if len(self.ids) else 0
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, vectors=self.vectors, ids=self.ids)
+        os.replace(tmp, self.path)
+
+    def add(self, article_ids, vectors, save=True):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+
+        with self._lock:
+            base = len(self.ids)
+            if base:
+                self.vectors = np.vstack([self.vectors, vectors.astype(np.float16)])
+            else:
+                self.vectors = vectors.astype(np.float16)
+            self.ids = np.concatenate([self.ids, article_ids])
+            self._pos.update({int(a): base + i for i, a in enumerate(article_ids)})
+
+            if self._ann is not None:
+                if len(self.ids) > self._ann.get_max_elements():
+                    self._ann.resize_index(max(len(self.ids), 2 * self._ann.get_max_elements()))
+                self._ann.add_items(vectors, article_ids, replace_deleted=True)
+            if save:
+                self._save()
+
+    def prune(self, keep_ids):
+        with self._lock:
+            mask = np.isin(self.ids, np.asarray(keep_ids, dtype=np.int64))
+            if mask.all():
+                return
+            removed = self.ids[~mask]
+            self.vectors = self.vectors[mask]
+            self.ids = self.ids[mask]
+            self._pos = {int(a): i for i, a in enumerate(self.ids)}
+
+            if self._ann is not None:
+                # 전체 재구성 대신 삭제 표시만 (검색 결과에서 빠지고 자리는 다음 add 에서 재사용)
+                for a in removed:
+                    self._ann.mark_deleted(int(a))
+                self._ann_deleted += len(removed)
+                if self._ann_deleted > ANN_REBUILD_RATIO * max(len(self.ids), 1):
+                    self._ann = None  # 삭제가 많이 쌓이면 그래프 품질을 위해 다음 검색 때 재구성
+            self._save()
+
+    def vector(self, article_id):
+        i = self._pos.get(int(article_id))
+        return None if i is None else self.vectors[i].astype(np.float32)
+
+    def _build_ann(self):
+        index = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+        index.init_index(
+            max_elements=len(self.ids), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M,
+            allow_replace_deleted=True,
+        )
+        index.add_items(self.vectors.astype(np.float32), self.ids)
+        index.set_ef(HNSW_EF_SEARCH)
+        self._ann_deleted = 0
+        return index
+
+    def search(self, query, k=5, exclude=None, use_ann=None):
+        """코사인 유사도 상위 k개 (article_id, score) 목록. use_ann=None 이면 크기로 자동 선택"""
+        if not len(self.ids):
+            return []
+
+        q = np.asarray(query, dtype=np.float32).ravel()
+        q /= np.linalg.norm(q) + 1e-12
+        n = min(k + (1 if exclude is not None else 0), len(self.ids))
+
+        if use_ann is None:
+            use_ann = hnswlib is not None and len(self.ids) >= ANN_MIN_ITEMS
+
+        with self._lock:
+            if use_ann:
+                if self._ann is None:
+                    self._ann = self._build_ann()
+                labels, dists = self._ann.knn_query(q, k=n)
+                hits = [(int(a), 1 - float(d)) for a, d in zip(labels[0], dists[0])]
+            else:
+                # float16 → float32 변환을 블록 단위로 해서 메모리 사용 제한
+                scores = np.concatenate([
+                    self.vectors[i:i + EXACT_BLOCK_ROWS].astype(np.float32) @ q
+                    for i in range(0, len(self.ids), EXACT_BLOCK_ROWS)
+                ])
+                top = np.argpartition(-scores, n - 1)[:n]
+                top = top[np.argsort(-scores[top])]
+                hits = [(int(self.ids[i]), float(scores[i])) for i in top]
+
+        return [h for h in hits if h[0] != exclude][:k]
@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import requests
 import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -13,8 +12,22 @@ import matplotlib.pyplot as plt
 import random
 import re
 import os
+import json
+import hashlib
+import time
+import html
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from sklearn.metrics.pairwise import cosine_similarity
 
+import http_client
+from alert_engine import StreamingAnomalyDetector
+from data_api import shared_data_api
+from news_vectors import NewsVectorIndex
+
 # KeyBERT (키워드 추출) – 설치 안 돼 있으면 자동으로 fallback 되도록 처리
 try:
     from keybert import KeyBERT
@@ -22,6 +35,11 @@ try:
 except Exception:
     kw_model = None
 
+# 캐시된 DataFrame 을 공유하므로, 파생 프레임은 쓰기 시점에만 복사되도록 설정
+# (pandas 3.0 부터는 항상 켜져 있고 옵션은 deprecated)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 
 
 # ===============================================
@@ -46,132 +64,107 @@ st.markdown("""
     border-radius: 8px;
     text-align: center;
 }
+/* 카드 그리드 공용 스타일 (render_card_grid) */
+.rc-grid {
+    display: grid;
+    gap: 12px;
+    margin-bottom: 12px;
+}
+.rc-card {
+    background-color: #2b2b2b;
+    padding: 12px;
+    border-radius: 8px;
+    text-align: center;
+    color: white;
+}
+.rc-label, .rc-sub { font-size: 18px; }
+.rc-value { font-size: 22px; font-weight: bold; }
+.rc-up { color: limegreen; }
+.rc-mid { color: gold; }
+.rc-down { color: red; }
 </style>
 """, unsafe_allow_html=True)
 
 # ===============================================
-# 숫자형 Metric (가격/변동률)
+# 카드 HTML 빌더
+#  - 각 함수는 카드 1개의 HTML 문자열만 만든다 (st 호출 없음)
+#  - 스타일은 상단 <style> 의 rc-* 클래스를 공유
 # ===============================================
+def _card_html(label, value, sub="", value_cls="", sub_cls=""):
+    sub_html = f"<div class='rc-sub {sub_cls}'>{sub}</div>" if sub else ""
+    return (
+        f"<div class='rc-card'>"
+        f"<div class='rc-label'>{html.escape(str(label))}</div>"
+        f"<div class='rc-value {value_cls}'>{html.escape(str(value))}</div>"
+        f"{sub_html}"
+        f"</div>"
+    )
+
+
+def _change_cls(change):
+    return "rc-up" if change >= 0 else "rc-down"
+
 
-def colored_metric(label, price, change):
-    color = "green" if change >= 0 else "red"
+def _fmt_price(price):
+    # 소액 코인(PEPE 등)은 유효숫자 기준으로 표시
+    return f"${price:,.2f}" if price >= 1 else f"${price:.6g}"
+
+
+def metric_card(label, price, change):
     arrow = "▲" if change >= 0 else "▼"
+    return _card_html(label, _fmt_price(price), f"{arrow} {abs(change)}%", sub_cls=_change_cls(change))
 
-    st.markdown(
-        f"""
-        <div style='background-color:#2b2b2b;
-                    padding:12px;
-                    border-radius:8px;
-                    text-align:center;
-                    color:white;'>
-            <div style='font-size:18px;'>{label}</div>
-            <div style='font-size:22px; font-weight:bold;'>${price:,}</div>
-            <div style='font-size:18px; color:{color};'>
-                {arrow} {abs(change)}%
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
 
-# ===============================================
-# 상태용 Metric (높음/중간/낮음 + 확장/축소)
-# green / yellow / red 자동 색상 적용
-# ===============================================
-def colored_status(label, value):
+def status_card(label, value):
     # 상태에 따른 색상 지정
     if value in ["높음", "확장 국면"]:
-        color = "limegreen"
+        cls = "rc-up"
     elif value in ["중간"]:
-        color = "gold"
+        cls = "rc-mid"
     elif value in ["낮음", "축소 국면"]:
-        color = "red"
+        cls = "rc-down"
     else:
-        color = "white"
+        cls = ""
+    return _card_html(label, value, value_cls=cls)
 
-    st.markdown(
-        f"""
-        <div style='background-color:#2b2b2b;
-                    padding:12px;
-                    border-radius:8px;
-                    text-align:center;
-                    color:white;'>
-            <div style='font-size:18px;'>{label}</div>
-            <div style='font-size:22px; font-weight:bold; color:{color};'>
-                {value}
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
 
-# ===============================================
-# Global Market Summary 디자인
-# ===============================================
-def custom_metric(label, value, change=None):
+def summary_card(label, value, change=None):
     """
     - value: 숫자/문자 그대로 표시
     - change: +% or -%
     색상은 변동률 기준으로 자동 결정
     """
-
     if change is None:
-        color = "white"
-        arrow = ""
-        change_text = ""
-    else:
-        if change >= 0:
-            color = "limegreen"
-            arrow = "▲"
-        else:
-            color = "red"
-            arrow = "▼"
+        return _card_html(label, value)
 
-        change_text = f"<div style='font-size:18px; color:{color};'>{arrow} {abs(change):.2f}%</div>"
+    arrow = "▲" if change >= 0 else "▼"
+    return _card_html(label, value, f"{arrow} {abs(change):.2f}%", sub_cls=_change_cls(change))
 
-    st.markdown(
-        f"""
-        <div style='background-color:#2b2b2b;
-                    padding:12px;
-                    border-radius:8px;
-                    text-align:center;
-                    color:white;'>
-            <div style='font-size:18px;'>{label}</div>
-            <div style='font-size:22px; font-weight:bold;'>{value}</div>
-            {change_text}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
 
-# ===============================================
-# fear&greed 디자인
-# ===============================================
-def fear_greed_card(score, diff):
+def fear_greed_card_html(score, diff):
     # 색상 규칙
     if score >= 70:
-        color = "limegreen"
+        cls = "rc-up"
     elif score >= 40:
-        color = "gold"
+        cls = "rc-mid"
     else:
-        color = "red"
+        cls = "rc-down"
 
     arrow = "▲" if diff >= 0 else "▼"
+    return _card_html("Fear & Greed Index", score, f"{arrow} {abs(diff)}", value_cls=cls, sub_cls=cls)
+
 
+# ===============================================
+# 카드 그리드 렌더러
+#  - 카드 여러 개를 st.markdown 한 번(요소 1개)으로 출력
+# ===============================================
+def render_card_grid(cards, columns=4):
+    if not cards:
+        return
     st.markdown(
-        f"""
-        <div style='background-color:#2b2b2b;
-                    padding:12px;
-                    border-radius:8px;
-                    text-align:center;
-                    color:white;'>
-            <div style='font-size:18px;'>Fear & Greed Index</div>
-            <div style='font-size:22px; font-weight:bold; color:{color};'>{score}</div>
-            <div style='font-size:18px; color:{color};'>
-                {arrow} {abs(diff)}
-            </div>
-        </div>
-        """,
+        f"<div class='rc-grid' style='grid-template-columns:repeat({columns}, minmax(0, 1fr));'>"
+        + "".join(cards)
+        + "</div>",
         unsafe_allow_html=True
     )
 
@@ -201,56 +194,106 @@ def generate_wordcloud(text):
 
 
 
+# 설정 파일(watchlist.csv 등)은 실행 위치와 무관하게 앱 폴더 기준으로 찾는다
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # ===============================================
-# Fear & Greed Proxy API (안정적, 차단 없음)
+# 외부 API 주소
+#  - 환경변수로 교체 가능 (loadtest/ 의 로컬 스텁 서버로 돌릴 때 사용)
 # ===============================================
-@st.cache_data(ttl=3600)
-def load_fear_greed_api():
-    url = "https://api.alternative.me/fng/?limit=2&format=json"  # 최근 2일 데이터 불러오기
+COINGECKO_API = os.environ.get("RADAR_COINGECKO_API", "https://api.coingecko.com/api/v3")
+ALTERNATIVE_API = os.environ.get("RADAR_ALTERNATIVE_API", "https://api.alternative.me")
+BLOCKCHAIN_API = os.environ.get("RADAR_BLOCKCHAIN_API", "https://api.blockchain.info")
+CRYPTOPANIC_API = os.environ.get("RADAR_CRYPTOPANIC_API", "https://cryptopanic.com/api/v1")
+COINTELEGRAPH_RSS = os.environ.get("RADAR_COINTELEGRAPH_RSS", "https://cointelegraph.com/rss")
+GOOGLE_NEWS = os.environ.get("RADAR_GOOGLE_NEWS", "https://news.google.com")
+COINDESK_KO = os.environ.get("RADAR_COINDESK_KO", "https://www.coindesk.com/ko")
+
+
+# ===============================================
+# 공용 JSON GET (CoinGecko 등 rate limit 있는 API용)
+#  - http_client 의 공유 세션(keep-alive 풀 + gzip/br + orjson) 사용
+#  - 429 응답은 Retry-After 만큼 기다렸다가 재시도
+# ===============================================
+HTTP_MAX_RETRIES = 3
+
 
+def _get_json(url, timeout=10):
+    return http_client.get_json(url, timeout=timeout, max_retries=HTTP_MAX_RETRIES)
+
+
+def _fetch_feed(url):
+    # RSS 도 공유 세션으로 받아서 파싱 (feedparser 자체 urllib 호출은 커넥션 재사용 안 됨)
     try:
-        r = requests.get(url, timeout=5)
-        data = r.json()
-
-        today = data["data"][0]          # 오늘 데이터
-        yesterday = data["data"][1]      # 전일 데이터
-
-        now_score = int(today["value"])
-        prev_score = int(yesterday["value"])
-        diff = now_score - prev_score
-        rating = today["value_classification"]
-
-        # timestamp → 날짜 변환
-        ts = int(today["timestamp"])
-        today_date = datetime.fromtimestamp(ts)
-
-        # 히스토리용 데이터프레임 생성 (2일 이상 확장하려면 limit=30으로 바꾸면 됨)
-        hist = pd.DataFrame([
-            {
-                "date": datetime.fromtimestamp(int(item["timestamp"])),
-                "score": int(item["value"])
-            }
-            for item in data["data"]
-        ])
-
-        return {
-            "score": now_score,
-            "rating": rating,
-            "diff": diff,
-            "hist": hist.sort_values("date")
-        }
+        r = http_client.get(url, timeout=5)
+        return feedparser.parse(r.content)
+    except Exception:
+        return feedparser.parse(b"")
 
-    except Exception as e:
-        st.error(f"Fear & Greed Proxy API 오류: {e}")
-        return {
-            "score": 50,
-            "rating": "Neutral",
-            "diff": 0,
-            "hist": pd.DataFrame({
-                "date": pd.date_range(end=pd.Timestamp.today(), periods=30),
-                "score": np.random.randint(40, 60, 30),
-            })
+
+# ===============================================
+# 로더 결과 DataFrame 압축
+#  - 반복 값(source/lang/core_sector/symbol) → category
+#  - 변화율/가격 → float32 (시총처럼 큰 값은 정밀도 때문에 float64 유지)
+#  - 자유 텍스트 → Arrow 기반 string
+# ===============================================
+def compact_frame(df, categories=(), floats=(), strings=()):
+    dtypes = {}
+    dtypes.update({c: "category" for c in categories if c in df.columns})
+    dtypes.update({c: "float32" for c in floats if c in df.columns})
+    dtypes.update({c: "string[pyarrow]" for c in strings if c in df.columns})
+    return df.astype(dtypes)
+
+
+# ===============================================
+# Fear & Greed Proxy API (안정적, 차단 없음)
+# ===============================================
+def _fetch_fear_greed():
+    url = f"{ALTERNATIVE_API}/fng/?limit=30&format=json"  # 최근 30일 (알림 엔진 초기 통계용)
+
+    data = _get_json(url, timeout=5)
+
+    today = data["data"][0]          # 오늘 데이터
+    yesterday = data["data"][1]      # 전일 데이터
+
+    now_score = int(today["value"])
+    prev_score = int(yesterday["value"])
+    diff = now_score - prev_score
+    rating = today["value_classification"]
+
+    # 히스토리용 데이터프레임 생성
+    hist = pd.DataFrame([
+        {
+            "date": datetime.fromtimestamp(int(item["timestamp"])),
+            "score": int(item["value"])
         }
+        for item in data["data"]
+    ])
+
+    return {
+        "score": now_score,
+        "rating": rating,
+        "diff": diff,
+        "hist": hist.sort_values("date")
+    }
+
+
+def _fallback_fear_greed():
+    return {
+        "score": 50,
+        "rating": "Neutral",
+        "diff": 0,
+        "hist": pd.DataFrame({
+            "date": pd.date_range(end=pd.Timestamp.today(), periods=30),
+            "score": np.random.randint(40, 60, 30),
+        })
+    }
+
+
+# 실패하면 예외를 그대로 올린다 (예외는 캐시되지 않음 → fallback/오류 표시는 스냅샷에서)
+@st.cache_data(ttl=3600)
+def load_fear_greed_api():
+    return _fetch_fear_greed()
 
 
 # ===============================================
@@ -259,44 +302,122 @@ def load_fear_greed_api():
 # - 의미: 최근 30일 동안 실제 사용된 BTC 주소 수
 # - 용도: 네트워크 활성도 / 시장 강도 판단
 # ===============================================
-@st.cache_data(ttl=300)  # 5분 캐시
-def load_btc_active_addresses():
+# 활성 주소 차트 조회 기간 (화면 라벨 → Blockchain.com timespan)
+BTC_ACTIVE_RANGES = {"30일": "30days", "1년": "1year", "3년": "3years", "전체": "all"}
+_TIMESPAN_DAYS = {"30days": 30, "1year": 365, "3years": 365 * 3, "all": 365 * 16}
+
+
+def _fetch_btc_active_addresses(timespan="30days"):
     """
     Blockchain.com Charts API를 이용하여
-    최근 30일 동안의 Bitcoin 활성 주소(active addresses) 데이터를 불러온다.
+    timespan 기간(기본 최근 30일) 동안의 Bitcoin 활성 주소(active addresses) 데이터를 불러온다.
 
     반환되는 데이터:
         - date: 날짜(datetime)
         - active_addresses: 활성 주소 수(int)
     """
-    url = "https://api.blockchain.info/charts/n-unique-addresses?timespan=30days&format=json"
+    url = f"{BLOCKCHAIN_API}/charts/n-unique-addresses?timespan={timespan}&format=json"
 
-    try:
-        # API 호출
-        r = requests.get(url, timeout=5)
-        js = r.json()
+    # API 호출
+    js = _get_json(url, timeout=5)
 
-        # 데이터프레임 변환
-        df = pd.DataFrame(js["values"])
-        df["date"] = df["x"].apply(lambda t: datetime.fromtimestamp(t))
-        df = df.rename(columns={"y": "active_addresses"})
+    # 데이터프레임 변환
+    df = pd.DataFrame(js["values"])
+    df["date"] = df["x"].apply(lambda t: datetime.fromtimestamp(t))
+    df = df.rename(columns={"y": "active_addresses"})
 
-        return df[["date", "active_addresses"]]
+    return df[["date", "active_addresses"]]
+
+
+def _fallback_btc_active_addresses(timespan="30days"):
+    # 오류 시 더미 데이터 반환 (서비스 지속성 확보)
+    days = _TIMESPAN_DAYS.get(timespan, 30)
+    return pd.DataFrame({
+        "date": pd.date_range(end=pd.Timestamp.today(), periods=days),
+        "active_addresses": np.random.randint(700000, 900000, days)
+    })
 
-    except Exception as e:
-        # 오류 시 더미 데이터 반환 (서비스 지속성 확보)
-        st.error(f"BTC Active Addresses API 오류 발생: {e}")
-        return pd.DataFrame({
-            "date": pd.date_range(end=pd.Timestamp.today(), periods=30),
-            "active_addresses": np.random.randint(700000, 900000, 30)
-        })
+
+@st.cache_data(ttl=300)  # 5분 캐시, 실패 시 예외 (호출하는 쪽에서 fallback)
+def load_btc_active_addresses(timespan="30days"):
+    return _fetch_btc_active_addresses(timespan)
+
+
+# ===============================================
+# Watchlist (추적 코인 목록)
+#  - watchlist.csv (id,symbol) 에서 불러오기, 경로는 RADAR_WATCHLIST 로 변경 가능
+#  - Home 카드용 BTC/ETH/SOL 은 항상 포함
+# ===============================================
+HOME_COINS = (
+    {"id": "bitcoin", "symbol": "BTC"},
+    {"id": "ethereum", "symbol": "ETH"},
+    {"id": "solana", "symbol": "SOL"},
+)
+
+WATCHLIST_PATH = os.path.join(APP_DIR, os.environ.get("RADAR_WATCHLIST", "watchlist.csv"))
+
+
+@st.cache_data(ttl=3600)
+def load_watchlist(path=WATCHLIST_PATH):
+    coins = list(HOME_COINS)
+
+    if os.path.exists(path):
+        wl = pd.read_csv(path, comment="#", dtype=str).reindex(columns=["id", "symbol"])
+        wl = wl.dropna(subset=["id"])
+        wl["id"] = wl["id"].str.strip().str.lower()
+        wl["symbol"] = wl["symbol"].fillna(wl["id"]).str.strip().str.upper()
+        coins += wl.to_dict("records")
+    elif "RADAR_WATCHLIST" in os.environ:
+        # 직접 지정한 파일이 없으면 Home 코인만으로 조용히 줄어들지 않도록 알림
+        st.warning(f"Watchlist 파일을 찾을 수 없습니다: {path} (Home 코인만 표시)")
+
+    # id 기준 중복 제거 (순서 유지)
+    seen = set()
+    unique = []
+    for c in coins:
+        if c["id"] not in seen:
+            seen.add(c["id"])
+            unique.append(c)
+    return tuple(unique)
 
 
 # ===============================================
 # CoinGecko 실시간 가격 API
+#  - simple/price 는 ids 를 콤마로 이어붙이므로 URL 길이 한도에 맞춰 청크 분할
+#  - 500개 코인 ≈ 3~4회 호출 (코인마다 1회 호출하지 않음)
 # ===============================================
-@st.cache_data(ttl=60)
-def load_prices_multi(coin_list):
+SIMPLE_PRICE_URL = (
+    f"{COINGECKO_API}/simple/price"
+    "?vs_currencies=usd&include_24hr_change=true"
+    "&include_market_cap=true&include_24hr_vol=true&ids="
+)
+PRICE_URL_MAX_LEN = 2000    # 프록시/CDN 이 자르지 않는 안전한 URL 길이
+PRICE_CHUNK_MAX_IDS = 250   # 한 번에 조회할 최대 코인 수
+PRICE_COLUMNS = ["id", "symbol", "price", "change", "market_cap", "volume_24h"]
+
+
+def _chunk_price_ids(ids):
+    """URL 길이/개수 한도를 넘지 않도록 id 목록을 청크로 나눈다."""
+    budget = PRICE_URL_MAX_LEN - len(SIMPLE_PRICE_URL)
+    chunk, length = [], 0
+
+    for cid in ids:
+        extra = len(cid) + (1 if chunk else 0)
+        if chunk and (length + extra > budget or len(chunk) >= PRICE_CHUNK_MAX_IDS):
+            yield chunk
+            chunk, length, extra = [], 0, len(cid)
+        chunk.append(cid)
+        length += extra
+
+    if chunk:
+        yield chunk
+
+
+def _get_simple_price(chunk):
+    return _get_json(SIMPLE_PRICE_URL + ",".join(chunk))
+
+
+def _fetch_prices_multi(coin_list):
     """
     coin_list 형식:
     [
@@ -304,139 +425,639 @@ def load_prices_multi(coin_list):
         {"id": "ethereum", "symbol": "ETH"},
         {"id": "solana", "symbol": "SOL"},
     ]
+
+    반환: id 를 index 로 하는 DataFrame
+        - symbol / price / change(24h %) / market_cap / volume_24h
     """
+    coins = pd.DataFrame(list(coin_list), columns=["id", "symbol"]).drop_duplicates("id")
 
-    ids = ",".join([c["id"] for c in coin_list])
+    data = {}
+    for chunk in _chunk_price_ids(coins["id"].tolist()):
+        data.update(_get_simple_price(chunk))
 
-    url = (
-        f"https://api.coingecko.com/api/v3/simple/price"
-        f"?ids={ids}&vs_currencies=usd&include_24hr_change=true"
-    )
+    raw = pd.DataFrame.from_dict(data, orient="index")
+    raw = raw.reindex(columns=["usd", "usd_24h_change", "usd_market_cap", "usd_24h_vol"])
+    raw.columns = ["price", "change", "market_cap", "volume_24h"]
 
-    r = requests.get(url, timeout=5)
-    data = r.json()
+    df = coins.set_index("id", drop=False).join(raw, how="inner")
+    df["change"] = df["change"].fillna(0).round(2)
+    return df[PRICE_COLUMNS]
 
-    output = {}
-    for c in coin_list:
-        cid = c["id"]
-        symbol = c["symbol"]
 
-        if cid in data:
-            output[symbol] = {
-                "price": data[cid]["usd"],
-                "change": round(data[cid]["usd_24h_change"], 2)
-            }
+def _fallback_prices_multi(coin_list):
+    # 가격을 못 받으면 0으로 채워서 카드 레이아웃 유지
+    df = pd.DataFrame(list(coin_list), columns=["id", "symbol"]).drop_duplicates("id")
+    df = df.assign(price=0.0, change=0.0, market_cap=0.0, volume_24h=0.0)
+    return df.set_index("id", drop=False)[PRICE_COLUMNS]
+
+
+@st.cache_data(ttl=60)
+def load_prices_multi(coin_list):
+    """
+    Home 카드 + Watchlist 가격의 단일 진입점 (스냅샷이 이 함수를 호출).
+    청크 단위 simple/price 호출, 실패 시 예외 (fallback 은 스냅샷에서).
+    """
+    return _fetch_prices_multi(coin_list)
+
+
+def filter_watchlist(prices, query="", sort_by="market_cap", ascending=False):
+    """가격 프레임에서 검색/정렬 (행 단위 루프 없이 벡터 연산)"""
+    df = prices
+    if query:
+        q = query.strip().lower()
+        mask = df["id"].str.contains(q, regex=False) | df["symbol"].str.lower().str.contains(q, regex=False)
+        df = df[mask]
+    return df.sort_values(sort_by, ascending=ascending, na_position="last")
 
-    return output
 
 # ===============================================
-# 글로벌 마켓 요약 (CoinGecko Global API)
+# Global Market Summary (시총 / 도미넌스 / 거래량)
+# CoinGecko Global API
 # ===============================================
-@st.cache_data(ttl=300)
+def _fetch_global_market():
+    url = f"{COINGECKO_API}/global"
+
+    data = _get_json(url, timeout=5)["data"]
+
+    return {
+        "market_cap": data["total_market_cap"].get("usd", 0),
+        "market_cap_change_24h": data.get("market_cap_change_percentage_24h_usd", 0),
+        "volume_24h": data["total_volume"].get("usd", 0),
+        "btc_dominance": data["market_cap_percentage"].get("btc", 0),
+        "eth_dominance": data["market_cap_percentage"].get("eth", 0),
+        "active_coins": data.get("active_cryptocurrencies", 0)
+    }
+
+
+def _fallback_global_market():
+    return {
+        "market_cap": 0,
+        "market_cap_change_24h": 0,
+        "volume_24h": 0,
+        "btc_dominance": 0,
+        "eth_dominance": 0,
+        "active_coins": 0
+    }
+
+
+@st.cache_data(ttl=300)  # 실패 시 예외 (fallback 은 스냅샷에서)
 def load_global_market():
-    url = "https://api.coingecko.com/api/v3/global"
-    try:
-        r = requests.get(url, timeout=5)
-        data = r.json()["data"]
-
-        return {
-            "total_mcap": data["total_market_cap"].get("usd", 0),
-            "mcap_change_24h": data.get("market_cap_change_percentage_24h_usd", 0),
-            "btc_dominance": data["market_cap_percentage"].get("btc", 0),
-            "active_coins": data.get("active_cryptocurrencies", 0)
-        }
-    except Exception as e:
-        st.error(f"Global Market API 오류: {e}")
-        return {
-            "total_mcap": 0,
-            "mcap_change_24h": 0,
-            "btc_dominance": 0,
-            "active_coins": 0
+    return _fetch_global_market()
+
+
+# ===============================================
+# Home 화면 마켓 스냅샷 (모든 소스 동시 호출)
+#  - 소스별 캐시 로더를 스레드로 병렬 호출 → TTL 이 남은 소스는 캐시에서 바로 반환되고
+#    만료된 소스만 실제로 API 호출 (Fear & Greed 1시간, Global/BTC 5분, 가격 1분)
+#  - 실패한 소스만 fallback 값으로 대체 (실패는 캐시되지 않아서 다음 갱신 때 재시도)
+# ===============================================
+class MarketSnapshot(TypedDict):
+    fear_greed: dict
+    global_market: dict
+    prices: pd.DataFrame
+    btc_active: pd.DataFrame
+    errors: list
+    failed_sources: list
+    fetched_at: datetime
+
+
+@st.cache_data(ttl=60)
+def load_market_snapshot(coin_list=HOME_COINS) -> MarketSnapshot:
+    # coin_list 에 watchlist 를 넘기면 Home 카드와 Watchlist 표를 한 번에 채운다
+    sources = {
+        "fear_greed": ("Fear & Greed Proxy API", load_fear_greed_api, (), _fallback_fear_greed),
+        "global_market": ("Global Market API", load_global_market, (), _fallback_global_market),
+        "prices": ("CoinGecko Price API", load_prices_multi, (coin_list,), _fallback_prices_multi),
+        "btc_active": ("BTC Active Addresses API", load_btc_active_addresses, (), _fallback_btc_active_addresses),
+    }
+
+    results = {}
+    errors = []
+    failed = []
+
+    # 워커 스레드에서는 st.* 호출을 하지 않고, 오류는 모아서 메인 스레드에서 표시
+    # (캐시 로더가 현재 세션 컨텍스트를 찾을 수 있도록 워커에 ScriptRunContext 연결)
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(sources),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    ) as pool:
+        futures = {
+            key: pool.submit(fetch, *args)
+            for key, (_, fetch, args, _) in sources.items()
         }
+        for key, future in futures.items():
+            label, _, args, fallback = sources[key]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors.append(f"{label} 오류: {e}")
+                failed.append(key)
+                results[key] = fallback(*args)
+
+    for msg in errors:
+        st.error(msg)
+
+    return MarketSnapshot(
+        fear_greed=results["fear_greed"],
+        global_market=results["global_market"],
+        prices=results["prices"],
+        btc_active=results["btc_active"],
+        errors=errors,
+        failed_sources=failed,
+        fetched_at=datetime.now(),
+    )
 
 # ===============================================
-# Web3 섹터 시총 데이터 (실시간: CoinGecko Categories API)
+# 차트 다운샘플링 (LTTB: Largest-Triangle-Three-Buckets)
+#  - 히스토리가 길어져도 Plotly 로 보내는 포인트 수는 차트 폭 수준으로 고정
+#  - 버킷마다 "직전 선택점 ~ 다음 버킷 평균" 과 만드는 삼각형이 가장 큰 점을 남김
+#    → 단순 간격 추출과 달리 급등/급락 같은 고점·저점이 사라지지 않음
+#  - (데이터, 포인트 수) 기준 캐시 → 기간/해상도 조합마다 한 번만 계산
 # ===============================================
+CHART_MAX_POINTS = int(os.environ.get("RADAR_CHART_MAX_POINTS", 800))  # 일반적인 차트 폭(px) 수준
+
+
+def lttb_indices(x, y, n_out):
+    """x 오름차순 시계열에서 LTTB 로 남길 n_out 개 인덱스"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 첫/마지막 점은 고정, 나머지 n-2 개를 n_out-2 개 버킷으로 분할
+    # bounds[i]:bounds[i+1] 가 i 번째 버킷, 마지막 구간 [n-1, n) 은 끝점
+    bounds = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    sizes = np.diff(bounds)
+    avg_x = np.add.reduceat(x, bounds[:-1]) / sizes
+    avg_y = np.add.reduceat(y, bounds[:-1]) / sizes
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y[i + 1] - ay))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+@st.cache_data(ttl=1800, max_entries=32)
+def downsample_lttb(df, x, y, max_points=CHART_MAX_POINTS):
+    """df[x, y] 를 x 기준 정렬 후 최대 max_points 개로 축소 (결측 행 제외)"""
+    data = df[[x, y]].dropna().sort_values(x)
+    if len(data) <= max_points:
+        return data.reset_index(drop=True)
+
+    xs = data[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = xs.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    keep = lttb_indices(xs, data[y].to_numpy(dtype=np.float64), max_points)
+    return data.iloc[keep].reset_index(drop=True)
+
+
 # ===============================================
-# Web3 섹터 시총 데이터 (실시간: CoinGecko Categories API)
-#  - 원시 카테고리 → 핵심 6개 섹터로 분류
+# 섹터 분류 규칙 (sector_taxonomy.json)
+#  - 키워드 → 단어 경계 정규식으로 한 번만 컴파일 (예: "ai" 가 "chain" 에 매칭되지 않음)
+#  - 카테고리 프레임 전체에 벡터 연산으로 적용, 결과는 category_id 기준으로 메모
 # ===============================================
-def _classify_core_sector(name: str) -> str:
-    n = name.lower()
+TAXONOMY_PATH = os.path.join(APP_DIR, os.environ.get("RADAR_TAXONOMY", "sector_taxonomy.json"))
 
-    if "ai" in n or "artificial intelligence" in n:
-        return "AI"
-    if "layer 2" in n or "layer-2" in n or "l2" in n or "rollup" in n:
-        return "Layer2"
-    if "defi" in n or "dex" in n or "yield" in n or "lending" in n or "amm" in n:
-        return "DeFi"
-    if "nft" in n or "collectible" in n:
-        return "NFT"
-    if "gaming" in n or "gamefi" in n or "metaverse" in n:
-        return "Gaming"
-    if "real world" in n or "rwa" in n or "tokenized" in n:
-        return "RWA"
-    return "Infra/기타"
 
+def _keyword_regex(keyword):
+    prefix = keyword.endswith("*")
+    words = keyword.rstrip("*").lower().split()
+    # "layer 2" → layer 2 / layer-2 / layer2 모두 매칭
+    body = r"[\s\-_]*".join(re.escape(w) for w in words)
+    return r"\b" + body + (r"" if prefix else r"\b")
 
-@st.cache_data(ttl=300)
+
+class SectorTaxonomy:
+    def __init__(self, rules):
+        self.default = rules.get("default", "Infra/기타")
+        self.sectors = [r["sector"] for r in rules["sectors"]]
+        self.patterns = [
+            "(?:" + "|".join(_keyword_regex(k) for k in r["keywords"]) + ")"
+            for r in rules["sectors"]
+        ]
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def classify_frame(self, category_ids, names):
+        """category_id/이름 Series → core_sector Series (처음 보는 id 만 계산)"""
+        category_ids = pd.Series(category_ids).reset_index(drop=True)
+        names = pd.Series(names).reset_index(drop=True).fillna("").astype(str)
+
+        unseen = ~category_ids.isin(self._memo.keys())
+        if unseen.any():
+            todo = names[unseen]
+            # 규칙 순서대로 우선순위 적용
+            conditions = [
+                todo.str.contains(p, flags=re.IGNORECASE, regex=True).to_numpy()
+                for p in self.patterns
+            ]
+            labels = np.select(conditions, self.sectors, default=self.default)
+            with self._lock:
+                self._memo.update(zip(category_ids[unseen], labels))
+
+        return category_ids.map(self._memo)
+
+
+@st.cache_resource
+def load_sector_taxonomy(path=TAXONOMY_PATH):
+    with open(path, encoding="utf-8") as f:
+        return SectorTaxonomy(json.load(f))
+
+
+# ===============================================
+# Web3 섹터 시총 데이터 (실시간: CoinGecko Categories API)
+#  - 원시 카테고리 → 핵심 6개 섹터로 분류
+# ===============================================
+@st.cache_resource(ttl=300)  # 공유 읽기 전용 — 반환 프레임을 직접 수정하지 말 것
 def load_sectors_realtime():
-    url = "https://api.coingecko.com/api/v3/coins/categories"
+    # 규칙 파일 오류는 API 오류와 구분해서 그대로 예외 (load_sectors_or_report 에서 표시)
+    taxonomy = load_sector_taxonomy()
+
+    # 실패 시 예외 → 캐시되지 않고 다음 렌더에서 재시도
+    data = _get_json(f"{COINGECKO_API}/coins/categories", timeout=5)
+
+    sectors = []
+    for d in data:
+        sectors.append({
+            "category_id": d.get("id", ""),
+            "sector": d.get("name", "Unknown"),
+            "market_cap": d.get("market_cap", 0),
+            "market_cap_change_24h": d.get("market_cap_change_24h", 0),
+        })
 
-    try:
-        r = requests.get(url, timeout=5)
-        data = r.json()
-
-        sectors = []
-        for d in data:
-            name = d.get("name", "Unknown")
-            mc = d.get("market_cap", 0)
-            mc_chg = d.get("market_cap_change_24h", 0)
-            category_id = d.get("id", "")
-
-            sectors.append({
-                "category_id": category_id,
-                "sector": name,
-                "market_cap": mc,
-                "market_cap_change_24h": mc_chg,
-                "core_sector": _classify_core_sector(name)
-            })
+    df = pd.DataFrame(sectors)
+    df["core_sector"] = taxonomy.classify_frame(df["category_id"], df["sector"]).to_numpy()
+    df["market_cap"] = pd.to_numeric(df["market_cap"], errors="coerce")
+    df["market_cap_change_24h"] = pd.to_numeric(df["market_cap_change_24h"], errors="coerce")
+    return compact_frame(
+        df,
+        categories=["core_sector"],
+        floats=["market_cap_change_24h"],
+        strings=["category_id", "sector"]
+    )
 
-        df = pd.DataFrame(sectors)
-        return df
 
+def load_sectors_or_report():
+    """Sectors 페이지용: 규칙 파일 오류 / API 오류를 구분해서 표시하고, 실패 시 빈 프레임"""
+    empty = pd.DataFrame(columns=["category_id", "sector", "market_cap", "market_cap_change_24h", "core_sector"])
+    try:
+        load_sector_taxonomy()
+    except Exception as e:
+        st.error(f"섹터 분류 규칙 파일 오류 ({TAXONOMY_PATH}): {e}")
+        return empty
+    try:
+        return load_sectors_realtime()
     except Exception as e:
         st.error(f"Sectors API 오류: {e}")
-        return pd.DataFrame(columns=["category_id", "sector", "market_cap", "market_cap_change_24h", "core_sector"])
+        return empty
 
 
 
 # ===============================================
-# 섹터별 Top 상승/하락 프로젝트
-# category_id 기준으로 조회
+# 핵심 섹터 집계 (core_sector 단위 시총 합계 / 평균 변화율)
 # ===============================================
+def summarize_core_sectors(sectors_rt):
+    core_summary = (
+        sectors_rt
+        .groupby("core_sector", observed=True)
+        .agg(
+            total_mcap=("market_cap", "sum"),
+            avg_mcap_chg=("market_cap_change_24h", "mean")
+        )
+        .reset_index()
+    )
+
+    # Infra/기타는 맨 아래로 보내기
+    core_summary["sort_key"] = core_summary["core_sector"].apply(
+        lambda x: 1 if x == "Infra/기타" else 0
+    )
+    return core_summary.sort_values(["sort_key", "core_sector"]).drop(columns=["sort_key"])
+
+
+# ===============================================
+# 로컬 저장소 (SQLite)
+#  - 경로: RADAR_DATA_DIR (기본 ./data) / radar.db
+#  - 커넥션은 세션 간 공유, 쓰기는 lock 으로 직렬화
+# ===============================================
+DATA_DIR = os.environ.get("RADAR_DATA_DIR", "data")
+
+
+@st.cache_resource
+def get_db():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(DATA_DIR, "radar.db"), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sector_snapshots (
+            ts           REAL NOT NULL,
+            core_sector  TEXT NOT NULL,
+            total_mcap   REAL,
+            share        REAL,
+            ret_1d       REAL,
+            ret_7d       REAL,
+            ret_30d      REAL,
+            share_chg_7d REAL,
+            PRIMARY KEY (core_sector, ts)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sector_snapshots_ts ON sector_snapshots (ts);
+
+        CREATE TABLE IF NOT EXISTS coin_categories (
+            category_id TEXT NOT NULL,
+            coin_id     TEXT NOT NULL,
+            PRIMARY KEY (category_id, coin_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_coin_categories_coin ON coin_categories (coin_id);
+
+        CREATE TABLE IF NOT EXISTS category_index_state (
+            category_id  TEXT PRIMARY KEY,
+            refreshed_at REAL NOT NULL,
+            n_coins      INTEGER
+        );
+
+        CREATE TABLE IF NOT EXISTS news_archive (
+            id         INTEGER PRIMARY KEY,
+            uid        TEXT NOT NULL UNIQUE,
+            fetched_at REAL NOT NULL,
+            title      TEXT,
+            source     TEXT,
+            lang       TEXT,
+            url        TEXT,
+            summary    TEXT,
+            keywords   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_news_archive_fetched ON news_archive (fetched_at);
+
+        -- 전문 검색 인덱스 (news_archive 를 content 테이블로 사용, 트리거로 동기화)
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, summary, keywords,
+            content='news_archive', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS news_archive_ai AFTER INSERT ON news_archive BEGIN
+            INSERT INTO news_fts(rowid, title, summary, keywords)
+            VALUES (new.id, new.title, new.summary, new.keywords);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_archive_ad AFTER DELETE ON news_archive BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, summary, keywords)
+            VALUES ('delete', old.id, old.title, old.summary, old.keywords);
+        END;
+    """)
+    return conn
+
+
+@st.cache_resource
+def get_db_lock():
+    return threading.Lock()
+
+
+# ===============================================
+# 섹터 로테이션 (타임스탬프 스냅샷 + 롤링 수익률/점유율)
+#  - 스냅샷이 들어올 때마다 1d/7d/30d 전 값을 인덱스로 1건씩만 조회해서
+#    롤링 값을 계산 후 행에 같이 저장 → 조회 시 전체 히스토리 재집계 없음
+# ===============================================
+ROTATION_WINDOWS = {"1d": 86400, "7d": 7 * 86400, "30d": 30 * 86400}
+SNAPSHOT_MIN_INTERVAL = 300  # 초 — load_sectors_realtime 캐시 주기와 동일
+
+
+def _window_tolerance(seconds):
+    # 기준 시점 직전 스냅샷이 이 범위 안에 없으면 롤링 값은 비워둔다
+    return max(3600, seconds * 0.1)
+
+
+def record_sector_snapshot(core_summary, ts=None):
+    """core_summary 1건을 스냅샷으로 저장. 저장했으면 True."""
+    ts = ts if ts is not None else time.time()
+    conn = get_db()
+
+    with get_db_lock():
+        last = conn.execute("SELECT MAX(ts) FROM sector_snapshots").fetchone()[0]
+        if last is not None and ts - last < SNAPSHOT_MIN_INTERVAL:
+            return False
+
+        total = float(core_summary["total_mcap"].sum())
+        rows = []
+
+        for sector, mcap in zip(core_summary["core_sector"], core_summary["total_mcap"]):
+            mcap = float(mcap)
+            share = mcap / total if total else None
+            prev = {}
+
+            for key, seconds in ROTATION_WINDOWS.items():
+                target = ts - seconds
+                prev[key] = conn.execute(
+                    "SELECT total_mcap, share FROM sector_snapshots "
+                    "WHERE core_sector = ? AND ts <= ? AND ts >= ? "
+                    "ORDER BY ts DESC LIMIT 1",
+                    (sector, target, target - _window_tolerance(seconds))
+                ).fetchone()
+
+            def _ret(key):
+                row = prev[key]
+                return mcap / row[0] - 1 if row and row[0] else None
+
+            share_prev = prev["7d"][1] if prev["7d"] else None
+
+            rows.append((
+                ts, sector, mcap, share,
+                _ret("1d"), _ret("7d"), _ret("30d"),
+                share - share_prev if share is not None and share_prev is not None else None,
+            ))
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sector_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    return True
+
+
 @st.cache_data(ttl=300)
-def load_sector_top_movers(category, top=10):
-    url = (
-        "https://api.coingecko.com/api/v3/coins/markets"
-        f"?vs_currency=usd&category={category}&order=market_cap_desc"
-        "&price_change_percentage=24h&per_page=100&page=1"
+def load_sector_rotation(days=30):
+    since = time.time() - days * 86400
+    df = pd.read_sql_query(
+        "SELECT * FROM sector_snapshots WHERE ts >= ? ORDER BY ts",
+        get_db(),
+        params=(since,)
     )
+    df["date"] = pd.to_datetime(df["ts"], unit="s")
+    return df
+
+
+# ===============================================
+# 코인 → 카테고리 멤버십 인덱스 (로컬 SQLite)
+#  - 카테고리별 구성 코인 id 만 저장, 오래된 카테고리부터 조금씩 갱신
+#  - 한 번의 실행에서 갱신하는 카테고리 수는 CATEGORY_INDEX_BATCH 로 제한
+# ===============================================
+CATEGORY_INDEX_TTL = 24 * 3600
+CATEGORY_INDEX_BATCH = 10
+CATEGORY_MAX_PAGES = 4
+MARKETS_URL = (
+    f"{COINGECKO_API}/coins/markets"
+    "?vs_currency=usd&order=market_cap_desc"
+    "&price_change_percentage=24h&per_page=250"
+)
 
+
+def _fetch_category_members(category_id):
+    members = []
+    for page_no in range(1, CATEGORY_MAX_PAGES + 1):
+        data = _get_json(f"{MARKETS_URL}&category={category_id}&page={page_no}")
+        members += [d["id"] for d in data]
+        if len(data) < 250:
+            break
+    return members
+
+
+@st.cache_resource
+def get_category_refresh_lock():
+    # 프로세스 공용 갱신 락 (한 번에 한 세션만 카테고리 인덱스 갱신)
+    return threading.Lock()
+
+
+def refresh_category_index(category_ids, budget=CATEGORY_INDEX_BATCH):
+    """
+    미수집/만료된 카테고리를 최대 budget 개 갱신. 갱신한 개수를 반환.
+    다른 세션이 이미 갱신 중이면 기다리지 않고 0 을 반환 (같은 카테고리 중복 수집 방지).
+    """
+    if not category_ids:
+        return 0
+
+    lock = get_category_refresh_lock()
+    if not lock.acquire(blocking=False):
+        return 0
     try:
-        r = requests.get(url, timeout=5)
-        data = r.json()
-        df = pd.DataFrame(data)
+        return _refresh_category_index(category_ids, budget)
+    finally:
+        lock.release()
+
+
+def _refresh_category_index(category_ids, budget):
+    conn = get_db()
+    now = time.time()
+    ph = ",".join("?" * len(category_ids))
+    state = dict(conn.execute(
+        f"SELECT category_id, refreshed_at FROM category_index_state WHERE category_id IN ({ph})",
+        list(category_ids)
+    ).fetchall())
+
+    # 한 번도 수집 안 된 카테고리 → 가장 오래된 카테고리 순
+    stale = sorted(
+        (c for c in category_ids if now - state.get(c, 0) > CATEGORY_INDEX_TTL),
+        key=lambda c: state.get(c, 0)
+    )[:budget]
+
+    refreshed = 0
+    for cat_id in stale:
+        try:
+            members = _fetch_category_members(cat_id)
+        except Exception:
+            break  # rate limit 등 → 다음 실행에서 이어서 갱신
+
+        with get_db_lock(), conn:
+            conn.execute("DELETE FROM coin_categories WHERE category_id = ?", (cat_id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO coin_categories VALUES (?, ?)",
+                [(cat_id, coin_id) for coin_id in members]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO category_index_state VALUES (?, ?, ?)",
+                (cat_id, time.time(), len(members))
+            )
+        refreshed += 1
 
-        df = df[["name", "symbol", "current_price", "price_change_percentage_24h"]]
+    return refreshed
 
-        top_gainers = df.sort_values("price_change_percentage_24h", ascending=False).head(top)
-        top_losers = df.sort_values("price_change_percentage_24h").head(top)
 
-        return top_gainers, top_losers
+def category_index_status(category_ids):
+    """(수집된 카테고리 수, 마지막 갱신 시각) — 갱신 시각은 Top Movers 캐시 키로 사용"""
+    if not category_ids:
+        return 0, 0.0
+    ph = ",".join("?" * len(category_ids))
+    covered, last = get_db().execute(
+        f"SELECT COUNT(*), MAX(refreshed_at) FROM category_index_state WHERE category_id IN ({ph})",
+        list(category_ids)
+    ).fetchone()
+    return covered, last or 0.0
 
-    except:
-        return pd.DataFrame(), pd.DataFrame()
+
+# ===============================================
+# 전체 마켓 스윕 (시총 상위 코인, 페이지 단위 조회)
+# ===============================================
+MARKET_SWEEP_PAGES = 4  # 250 x 4 = 시총 상위 1000개
+
+
+@st.cache_data(ttl=300)
+def load_market_sweep(pages=MARKET_SWEEP_PAGES):
+    frames = []
+    for page_no in range(1, pages + 1):
+        data = _get_json(f"{MARKETS_URL}&page={page_no}")
+        if not data:
+            break
+        frames.append(pd.DataFrame(data))
+        if len(data) < 250:
+            break
+
+    if not frames:
+        return pd.DataFrame(columns=["id", "name", "symbol", "current_price", "price_change_percentage_24h"])
+    df = pd.concat(frames, ignore_index=True).drop_duplicates("id")
+    return df[["id", "name", "symbol", "current_price", "price_change_percentage_24h"]]
+
+
+# ===============================================
+# 섹터별 Top 상승/하락 프로젝트
+#  - 마켓 스윕 1회 결과를 카테고리 인덱스와 조인 (카테고리별 API 호출 없음)
+#  - 여러 카테고리에 속한 코인은 1행으로 합치고 category 에 이어서 표시
+# ===============================================
+@st.cache_resource(ttl=300)  # 공유 읽기 전용
+def load_sector_top_movers(category_ids, top=10, index_version=0.0):
+    """
+    index_version(인덱스 마지막 갱신 시각)이 캐시 키에 들어가므로 인덱스가 바뀌면 자동으로 새로 계산.
+    시장 스윕 실패는 예외로 올려서 캐시되지 않게 한다 (오류 표시는 호출하는 쪽).
+    """
+    empty = pd.DataFrame(), pd.DataFrame()
+    if not category_ids:
+        return empty
+
+    market = load_market_sweep()
+
+    ph = ",".join("?" * len(category_ids))
+    members = pd.read_sql_query(
+        f"SELECT coin_id, category_id FROM coin_categories WHERE category_id IN ({ph})",
+        get_db(),
+        params=list(category_ids)
+    )
+    if members.empty:
+        return empty
+
+    names = load_sectors_realtime().set_index("category_id")["sector"]
+    members["category"] = members["category_id"].map(names).fillna(members["category_id"])
+    per_coin = (
+        members.groupby("coin_id")["category"]
+        .agg(lambda cats: ", ".join(sorted(set(cats))))
+    )
+
+    df = market.merge(per_coin, left_on="id", right_index=True, how="inner")
+    df = df.dropna(subset=["price_change_percentage_24h"]).drop(columns=["id"])
+
+    df = compact_frame(
+        df,
+        categories=["symbol"],
+        floats=["current_price", "price_change_percentage_24h"],
+        strings=["name", "category"]
+    )
+
+    top_gainers = df.nlargest(top, "price_change_percentage_24h")
+    top_losers = df.nsmallest(top, "price_change_percentage_24h")
+    return top_gainers, top_losers
 
 
 # ===============================================
@@ -447,15 +1068,14 @@ def load_sector_top_movers(category, top=10):
 #  - 글로벌: CryptoPanic, Cointelegraph
 #  - 한국어: Google News(암호화폐/블록체인 검색)
 # ===============================================
-@st.cache_data(ttl=1800)
+@st.cache_resource(ttl=1800)  # 공유 읽기 전용
 def load_news_all():
 
     news_items = []
 
     # -------- 1) CryptoPanic API (글로벌, 영어) --------
     try:
-        res = requests.get("https://cryptopanic.com/api/v1/posts/?auth_token=&public=true", timeout=5)
-        js = res.json()
+        js = _get_json(f"{CRYPTOPANIC_API}/posts/?auth_token=&public=true", timeout=5)
         for item in js.get("results", []):
             news_items.append({
                 "title": item["title"],
@@ -468,7 +1088,7 @@ def load_news_all():
 
     # -------- 2) Cointelegraph RSS (글로벌, 영어) --------
     try:
-        feed = feedparser.parse("https://cointelegraph.com/rss")
+        feed = _fetch_feed(COINTELEGRAPH_RSS)
         for entry in feed.entries[:10]:
             news_items.append({
                 "title": entry.title,
@@ -482,13 +1102,13 @@ def load_news_all():
     # -------- 3) Google News RSS (한국어, '암호화폐 OR 비트코인 OR 블록체인') --------
     # -------- 한국어 Google News (본문 포함) --------
     kr_feed_url = (
-        "https://news.google.com/rss/search?"
+        f"{GOOGLE_NEWS}/rss/search?"
         "q=암호화폐+OR+비트코인+OR+블록체인&hl=ko&gl=KR&ceid=KR:ko"
     )
-    feed_kr = feedparser.parse(kr_feed_url)
+    feed_kr = _fetch_feed(kr_feed_url)
 
     for entry in feed_kr.entries[:40]:
-        url = entry.link.replace("./articles/", "https://news.google.com/articles/")
+        url = entry.link.replace("./articles/", f"{GOOGLE_NEWS}/articles/")
         body = extract_article_body(url)
 
         news_items.append({
@@ -501,7 +1121,7 @@ def load_news_all():
 
     # -------- 4) (옵션) 코인데스크 한국어 HTML 스크래핑 — 구조 바뀌면 깨질 수 있음 --------
     try:
-        r = requests.get("https://www.coindesk.com/ko", timeout=5)
+        r = http_client.get(COINDESK_KO, timeout=5)
         soup = BeautifulSoup(r.text, "html.parser")
         # 메인 기사 카드 기준으로 제목 일부 긁기 (필요시 직접 class 수정하면 됨)
         for h in soup.find_all("h3")[:15]:
@@ -520,7 +1140,11 @@ def load_news_all():
     df = pd.DataFrame(news_items)
     if df.empty:
         return pd.DataFrame(columns=["title", "source", "summary_raw", "lang"])
-    return df
+    return compact_frame(
+        df,
+        categories=["source", "lang"],
+        strings=["title", "summary_raw", "url"]
+    )
 
 
 # ===============================================
@@ -567,7 +1191,7 @@ def summarize(text, max_sentences=3, max_chars=400):
 
 def extract_article_body(url):
     try:
-        r = requests.get(url, timeout=5)
+        r = http_client.get(url, timeout=5)
         soup = BeautifulSoup(r.text, "html.parser")
 
         # 뉴스 사이트 공통 패턴
@@ -698,107 +1322,348 @@ def topic_clustering(df, n_clusters=5):
 
 
 # ===============================================
-# Global Market Summary (시총 / 도미넌스 / 거래량)
-# CoinGecko Free API
+# 뉴스 요약/키워드 처리 (피드 갱신 시 1회) + 아카이브 저장
 # ===============================================
-@st.cache_data(ttl=300)
-def load_global_market():
-    url = "https://api.coingecko.com/api/v3/global"
-
-    try:
-        r = requests.get(url, timeout=5)
-        data = r.json()["data"]
-
-        return {
-            "market_cap": data["total_market_cap"]["usd"],
-            "volume_24h": data["total_volume"]["usd"],
-            "btc_dominance": data["market_cap_percentage"]["btc"],
-            "eth_dominance": data["market_cap_percentage"]["eth"],
-            "market_cap_change_24h": data.get("market_cap_change_percentage_24h_usd", 0)
-        }
+@st.cache_resource(ttl=1800)  # 공유 읽기 전용
+def load_news_processed():
+    df = load_news_all()
+    if df.empty:
+        return df.assign(summary=pd.Series(dtype=str), keywords=pd.Series(dtype=object))
 
-    except Exception as e:
-        st.error(f"Global Market API 오류: {e}")
-        return {
-            "market_cap": 0,
-            "volume_24h": 0,
-            "btc_dominance": 0,
-            "eth_dominance": 0,
-            "market_cap_change_24h": 0
-        }
+    # TextRank 요약 + KeyBERT 키워드 생성
+    df = df.assign(
+        summary=df["summary_raw"].apply(lambda x: textrank_summarize(x, max_sent=3)),
+        keywords=df["summary_raw"].apply(lambda x: extract_keywords(x, top_k=5)),
+    )
+    archive_news(df)
+    embed_new_articles()
+    return df
 
 
 # ===============================================
-# Navigation
+# 뉴스 아카이브 (SQLite FTS5 전문 검색)
+#  - 가져온 기사는 모두 누적 저장 (url 또는 출처+제목 기준 중복 제거)
+#  - 보관 기간(RADAR_NEWS_RETENTION_DAYS)이 지난 기사는 삭제 후 인덱스 최적화
+#  - 한국어 조사 대응을 위해 검색어는 접두어 검색("비트코인" → "비트코인이")
 # ===============================================
-page = st.sidebar.radio(
-    "Navigation",
-    ["📌 Home", "📰 News", "🧩 Sectors"]
-)
+NEWS_RETENTION_DAYS = int(os.environ.get("RADAR_NEWS_RETENTION_DAYS", "30"))
+
+
+def _news_uid(row):
+    key = row.get("url") if isinstance(row.get("url"), str) else f"{row['source']}|{row['title']}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def archive_news(df):
+    now = time.time()
+    rows = [
+        (
+            _news_uid(row), now,
+            row["title"], row["source"], row["lang"],
+            row["url"] if isinstance(row.get("url"), str) else None,
+            row["summary"], ", ".join(row["keywords"])
+        )
+        for row in df.to_dict("records")
+    ]
+
+    conn = get_db()
+    with get_db_lock(), conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO news_archive "
+            "(uid, fetched_at, title, source, lang, url, summary, keywords) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+    compact_news_archive()
+
+
+def compact_news_archive(retention_days=NEWS_RETENTION_DAYS):
+    cutoff = time.time() - retention_days * 86400
+    conn = get_db()
+    with get_db_lock(), conn:
+        deleted = conn.execute("DELETE FROM news_archive WHERE fetched_at < ?", (cutoff,)).rowcount
+        if deleted:
+            # 삭제로 쪼개진 FTS 세그먼트 병합
+            conn.execute("INSERT INTO news_fts(news_fts) VALUES ('optimize')")
+
+    if deleted:
+        keep = [r[0] for r in conn.execute("SELECT id FROM news_archive")]
+        get_news_vectors().prune(keep)
+    return deleted
+
+
+def _fts_query(text):
+    # 사용자 입력 → 토큰별 접두어 검색 AND 조합 (FTS 문법 문자는 제거)
+    tokens = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def search_news(query, lang=None, limit=50):
+    match = _fts_query(query)
+    if not match:
+        return pd.DataFrame(columns=["fetched_at", "title", "source", "lang", "url", "summary", "keywords"])
+
+    sql = (
+        "SELECT a.fetched_at, a.title, a.source, a.lang, a.url, a.summary, a.keywords "
+        "FROM news_fts JOIN news_archive a ON a.id = news_fts.rowid "
+        "WHERE news_fts MATCH ?"
+    )
+    params = [match]
+    if lang:
+        sql += " AND a.lang = ?"
+        params.append(lang)
+    sql += " ORDER BY bm25(news_fts, 5.0, 1.0, 2.0) LIMIT ?"
+    params.append(limit)
+
+    df = pd.read_sql_query(sql, get_db(), params=params)
+    df["fetched_at"] = pd.to_datetime(df["fetched_at"], unit="s")
+    return df
+
+
+def news_archive_count():
+    return get_db().execute("SELECT COUNT(*) FROM news_archive").fetchone()[0]
 
 
 # ===============================================
-# PAGE 1 — HOME
+# 뉴스 임베딩 벡터 인덱스 (의미 기반 검색 / 관련 기사)
+#  - kw_model(다국어 MiniLM) 임베딩을 float16 행렬로 저장 → 한/영 교차 검색
+#  - 저장/검색은 news_vectors.py (hnswlib 가 있으면 ANN, 없으면 블록 단위 정확 검색)
 # ===============================================
-if page == "📌 Home":
+@st.cache_resource
+def get_news_vectors():
+    return NewsVectorIndex(DATA_DIR)
+
+
+def embed_new_articles():
+    """아카이브에 새로 들어온 기사만 임베딩해서 인덱스에 추가"""
+    if kw_model is None:
+        return 0
+
+    store = get_news_vectors()
+    rows = get_db().execute(
+        "SELECT id, title, summary FROM news_archive WHERE id > ? ORDER BY id",
+        (store.max_id,)
+    ).fetchall()
+    if not rows:
+        return 0
+
+    vectors = kw_model.model.embed([f"{title}. {summary or ''}" for _, title, summary in rows])
+    store.add([r[0] for r in rows], vectors)
+    return len(rows)
+
+
+def _archive_rows(article_ids, scores):
+    if not article_ids:
+        return pd.DataFrame(columns=["fetched_at", "title", "source", "lang", "url", "keywords", "similarity"])
+
+    ph = ",".join("?" * len(article_ids))
+    df = pd.read_sql_query(
+        f"SELECT id, fetched_at, title, source, lang, url, keywords FROM news_archive WHERE id IN ({ph})",
+        get_db(),
+        params=list(article_ids)
+    )
+    df["similarity"] = df["id"].map(dict(zip(article_ids, scores)))
+    df["fetched_at"] = pd.to_datetime(df["fetched_at"], unit="s")
+    return df.sort_values("similarity", ascending=False).drop(columns=["id"])
 
-    st.title("📊 Web3 Chain Radar Dashboard")
 
-    # 데이터 불러오기
-    fg = load_fear_greed_api()
-    global_mkt = load_global_market()
+def semantic_search_news(query, lang=None, limit=20):
+    if kw_model is None or not query.strip():
+        return _archive_rows([], [])
 
-    # 실시간 가격
-    coin_list = [
-        {"id": "bitcoin", "symbol": "BTC"},
-        {"id": "ethereum", "symbol": "ETH"},
-        {"id": "solana", "symbol": "SOL"},
-    ]
+    q = kw_model.model.embed([query])[0]
+    # 언어 필터는 검색 후 적용하므로 여유 있게 가져온다
+    hits = get_news_vectors().search(q, k=limit * 3 if lang else limit)
+    df = _archive_rows([h[0] for h in hits], [h[1] for h in hits])
+    if lang:
+        df = df[df["lang"] == lang]
+    return df.head(limit)
 
-    prices = load_prices_multi(coin_list)
 
-    col1, col2, col3, col4 = st.columns(4)
-   
-    with col1:
-        fear_greed_card(fg["score"], fg["diff"])
+def related_articles(uid, k=5):
+    row = get_db().execute("SELECT id FROM news_archive WHERE uid = ?", (uid,)).fetchone()
+    if row is None:
+        return _archive_rows([], [])
 
-    with col2:
-        colored_metric("BTC", prices["BTC"]["price"], prices["BTC"]["change"])
+    store = get_news_vectors()
+    vec = store.vector(row[0])
+    if vec is None:
+        return _archive_rows([], [])
 
-    with col3:
-        colored_metric("ETH", prices["ETH"]["price"], prices["ETH"]["change"])
+    hits = store.search(vec, k=k, exclude=row[0])
+    return _archive_rows([h[0] for h in hits], [h[1] for h in hits])
 
-    with col4:
-        colored_metric("SOL", prices["SOL"]["price"], prices["SOL"]["change"])
 
 # ===============================================
-# Global Market Summary (실시간)
+# 이상 징후 알림 엔진 (가격 변화율 / Fear & Greed / BTC 활성 주소)
+#  - 엔진은 세션 간 공유, 새 포인트만 O(1) 로 반영 (alert_engine.py)
+#  - fallback(더미) 데이터는 통계를 오염시키므로 넣지 않음
 # ===============================================
-    
-    st.subheader("🌍 Global Market Summary")
+@st.cache_resource
+def get_alert_engine():
+    return StreamingAnomalyDetector(alpha=0.1, z_threshold=3.0, warmup=10)
 
-    gm = load_global_market()
 
-    g1, g2, g3, g4 = st.columns(4)
+ALERT_LABELS = {"fng": "Fear & Greed", "active": "BTC 활성 주소"}
 
-    with g1:
-        custom_metric(
-            "전체 암호화폐 시총 (USD)",
-            f"{gm['market_cap']:,.0f}",
-            gm["market_cap_change_24h"]
-        )
 
-    with g2:
-        custom_metric(
-            "24h 거래량 (USD)",
-            f"{gm['volume_24h']:,.0f}"
+def feed_alert_engine(snapshot):
+    engine = get_alert_engine()
+    failed = snapshot["failed_sources"]
+
+    if "prices" not in failed:
+        prices = snapshot["prices"]
+        engine.update_many(
+            ("price:" + prices["id"]).tolist(),
+            prices["change"].to_numpy(),
+            snapshot["fetched_at"].timestamp()
         )
 
-    with g3:
-        colored_status("BTC Dominance", f"{gm['btc_dominance']:.2f}%")
+    # 일별 시리즈는 과거 포인트부터 순서대로 (이미 반영한 날짜는 엔진이 무시)
+    if "fear_greed" not in failed:
+        for date, score in zip(snapshot["fear_greed"]["hist"]["date"], snapshot["fear_greed"]["hist"]["score"]):
+            engine.update("fng", score, pd.Timestamp(date).timestamp())
+
+    if "btc_active" not in failed:
+        active = snapshot["btc_active"].sort_values("date")
+        for date, value in zip(active["date"], active["active_addresses"]):
+            engine.update("active", value, pd.Timestamp(date).timestamp())
 
-    with g4:
-        colored_status("ETH Dominance", f"{gm['eth_dominance']:.2f}%")
+
+def _alert_label(key):
+    if key.startswith("price:"):
+        return f"{key.split(':', 1)[1]} 24h 변화율"
+    return ALERT_LABELS.get(key, key)
+
+
+# ===============================================
+# 읽기 전용 데이터 API (data_api.py)
+#  - RADAR_DATA_API_PORT 가 설정된 경우에만 프로세스당 1번 기동
+#    (캐시 초기화와 무관하게 유지되도록 cache_resource 가 아닌 모듈 전역 싱글턴 사용)
+#  - 페이지가 이미 계산한 결과를 publish → API 는 그 값만 직렬화 (추가 업스트림 호출/재계산 없음)
+#  - 값은 해당 페이지가 렌더링될 때만 갱신되므로 로더 캐시 TTL 을 같이 넘겨서 신선도 표시
+# ===============================================
+DATA_API_HOST = os.environ.get("RADAR_DATA_API_HOST", "127.0.0.1")
+
+# 데이터셋별 원본 로더의 캐시 TTL(초) — 로더 데코레이터의 ttl 을 바꾸면 같이 맞출 것
+DATA_API_TTLS = {
+    "fear_greed": 3600,          # load_fear_greed_api
+    "fear_greed_history": 3600,
+    "global_market": 300,        # load_global_market
+    "prices": 60,                # load_prices_multi
+    "btc_active": 300,           # load_btc_active_addresses
+    "sectors": 300,              # load_sectors_realtime
+    "core_summary": 300,
+    "news": 1800,                # load_news_processed
+}
+
+
+def _data_api_port():
+    """RADAR_DATA_API_PORT → (포트, 오류 메시지). 미설정이면 (None, None)"""
+    value = os.environ.get("RADAR_DATA_API_PORT", "").strip()
+    if not value:
+        return None, None
+    if value.isdigit() and 0 < int(value) < 65536:
+        return int(value), None
+    return None, f"RADAR_DATA_API_PORT 값이 올바르지 않습니다: {value!r}"
+
+
+DATA_API_PORT, DATA_API_PORT_ERROR = _data_api_port()
+
+
+def get_data_api():
+    return shared_data_api(DATA_API_HOST, DATA_API_PORT)
+
+
+def publish_dataset(name, obj, version=None, fetched_at=None):
+    get_data_api().publish(name, obj, version, ttl=DATA_API_TTLS[name], fetched_at=fetched_at)
+
+
+def publish_snapshot(snapshot):
+    failed = snapshot["failed_sources"]
+    version = snapshot["fetched_at"]  # cache_data 는 매번 복사본을 주므로 조회 시각으로 버전 판단
+    fetched_at = version.timestamp()
+
+    # fallback 더미 값은 공개하지 않음
+    if "fear_greed" not in failed:
+        fg = snapshot["fear_greed"]
+        publish_dataset("fear_greed", {k: v for k, v in fg.items() if k != "hist"}, version, fetched_at)
+        publish_dataset("fear_greed_history", fg["hist"], version, fetched_at)
+    for key in ("global_market", "prices", "btc_active"):
+        if key not in failed:
+            publish_dataset(key, snapshot[key], version, fetched_at)
+
+
+# ===============================================
+# Navigation
+#  - ?page=home|news|sectors 로 특정 페이지 바로 열기 (부하 테스트도 이 경로 사용)
+# ===============================================
+PAGE_SLUGS = {"home": "📌 Home", "news": "📰 News", "sectors": "🧩 Sectors"}
+page_options = list(PAGE_SLUGS.values())
+start_page = PAGE_SLUGS.get(st.query_params.get("page", "home"), page_options[0])
+
+page = st.sidebar.radio(
+    "Navigation",
+    page_options,
+    index=page_options.index(start_page)
+)
+
+
+# ===============================================
+# PAGE 1 — HOME
+# ===============================================
+if page == "📌 Home":
+
+    st.title("📊 Web3 Chain Radar Dashboard")
+
+    # 데이터 불러오기 (Fear & Greed / 글로벌 / 가격 / 온체인 동시 호출)
+    watchlist = load_watchlist()
+    snapshot = load_market_snapshot(watchlist)
+    fg = snapshot["fear_greed"]
+    prices = snapshot["prices"]
+    feed_alert_engine(snapshot)
+    publish_snapshot(snapshot)
+
+    # Home 카드용 BTC/ETH/SOL (조회 실패한 코인은 0 으로 표시)
+    home_prices = prices.reindex([c["id"] for c in HOME_COINS])[["price", "change"]].fillna(0)
+
+    render_card_grid(
+        [fear_greed_card_html(fg["score"], fg["diff"])]
+        + [
+            metric_card(
+                coin["symbol"],
+                home_prices.loc[coin["id"], "price"],
+                home_prices.loc[coin["id"], "change"]
+            )
+            for coin in HOME_COINS
+        ],
+        columns=4
+    )
+
+# ===============================================
+# Global Market Summary (실시간)
+# ===============================================
+    
+    st.subheader("🌍 Global Market Summary")
+
+    gm = snapshot["global_market"]
+
+    render_card_grid(
+        [
+            summary_card(
+                "전체 암호화폐 시총 (USD)",
+                f"{gm['market_cap']:,.0f}",
+                gm["market_cap_change_24h"]
+            ),
+            summary_card(
+                "24h 거래량 (USD)",
+                f"{gm['volume_24h']:,.0f}"
+            ),
+            status_card("BTC Dominance", f"{gm['btc_dominance']:.2f}%"),
+            status_card("ETH Dominance", f"{gm['eth_dominance']:.2f}%"),
+        ],
+        columns=4
+    )
 
 
     # ======== 3 COLUMN LAYOUT ========
@@ -815,12 +1680,29 @@ if page == "📌 Home":
 
     # CENTER ---------------------------
     with center:
-        st.subheader("📈 BTC Active Addresses (30일 실데이터)")
-        btc_active = load_btc_active_addresses()
+        st.subheader("📈 BTC Active Addresses")
+        range_label = st.radio(
+            "기간", list(BTC_ACTIVE_RANGES), horizontal=True, label_visibility="collapsed"
+        )
+        timespan = BTC_ACTIVE_RANGES[range_label]
+
+        # 30일은 스냅샷 데이터 재사용, 긴 기간만 별도 조회
+        if timespan == "30days":
+            btc_active = snapshot["btc_active"]
+        else:
+            try:
+                btc_active = load_btc_active_addresses(timespan)
+            except Exception as e:
+                st.error(f"BTC Active Addresses API 오류 발생: {e}")
+                btc_active = _fallback_btc_active_addresses(timespan)
+        chart_data = downsample_lttb(btc_active, "date", "active_addresses")
+
         st.plotly_chart(
-            px.line(btc_active, x="date", y="active_addresses", height=300),
+            px.line(chart_data, x="date", y="active_addresses", height=300),
             use_container_width=True
         )
+        if len(chart_data) < len(btc_active):
+            st.caption(f"원본 {len(btc_active):,}개 → 표시 {len(chart_data):,}개 (LTTB 다운샘플링)")
       
 
     # RIGHT ---------------------------
@@ -831,12 +1713,52 @@ if page == "📌 Home":
         score = fg["score"]
         risk = "높음" if score > 70 else "중간" if score > 40 else "낮음"
 
-        colored_status("시장 리스크", risk)
+        # BTC 추세 판단
+        trend = "확장 국면" if home_prices.loc["bitcoin", "change"] > 0 else "축소 국면"
 
+        render_card_grid(
+            [status_card("시장 리스크", risk), status_card("BTC 추세", trend)],
+            columns=1
+        )
 
-        # BTC 추세 판단
-        trend = "확장 국면" if prices["BTC"]["change"] > 0 else "축소 국면"
-        colored_status("BTC 추세", trend)
+
+    # ===============================================
+    # Watchlist (전체 추적 코인 — 검색/정렬)
+    # ===============================================
+    st.subheader(f"📋 Watchlist ({len(prices)}개 코인)")
+
+    w1, w2, w3, w4 = st.columns([3, 2, 1, 1])
+    with w1:
+        wl_query = st.text_input("코인 검색 (id / 심볼)", "")
+    with w2:
+        wl_sort = st.selectbox(
+            "정렬 기준",
+            ["market_cap", "change", "volume_24h", "price"],
+            format_func=lambda c: {
+                "market_cap": "시총",
+                "change": "24h 변화율",
+                "volume_24h": "24h 거래량",
+                "price": "가격",
+            }[c]
+        )
+    with w3:
+        wl_asc = st.checkbox("오름차순", value=False)
+    with w4:
+        wl_cards = st.checkbox("카드 보기", value=False)
+
+    wl_view = filter_watchlist(prices, wl_query, wl_sort, wl_asc)
+
+    if wl_cards:
+        # 전체 카드를 HTML 블록 하나로 출력
+        render_card_grid(
+            [
+                metric_card(sym, price, chg)
+                for sym, price, chg in zip(wl_view["symbol"], wl_view["price"], wl_view["change"])
+            ],
+            columns=6
+        )
+    else:
+        st.dataframe(wl_view, height=400, hide_index=True)
 
 
 
@@ -848,25 +1770,49 @@ elif page == "📰 News":
 
     st.title("📰 Web3 뉴스 분석 (글로벌 + 한국어)")
 
-    df = load_news_all()
+    df = load_news_processed()
+    if not df.empty:
+        publish_dataset("news", df)
+
+    # 언어 필터 (아카이브 검색 + 현재 피드 공통)
+    st.subheader("🧩 필터")
+    lang_opt = st.selectbox("언어", ["전체", "한국어만", "영어만"])
+    lang_code = {"한국어만": "ko", "영어만": "en"}.get(lang_opt)
+
+    # -------- 아카이브 검색 (누적 기사 전체) --------
+    news_query = st.text_input(
+        f"🔎 뉴스 아카이브 검색 (최근 {NEWS_RETENTION_DAYS}일 · {news_archive_count():,}건)", ""
+    )
+    semantic = st.checkbox(
+        "의미 기반 검색 (한/영 교차)",
+        value=False,
+        disabled=kw_model is None,
+        help="다국어 임베딩으로 뜻이 비슷한 기사를 찾습니다. KeyBERT 모델이 있어야 사용 가능합니다."
+    )
+    if news_query:
+        if semantic:
+            found = semantic_search_news(news_query, lang=lang_code)
+        else:
+            found = search_news(news_query, lang=lang_code)
+        st.subheader(f"🔎 검색 결과 ({len(found)}건)")
+        if found.empty:
+            st.info("검색 결과가 없습니다.")
+        else:
+            st.dataframe(
+                found[["fetched_at", "title", "source", "lang", "keywords", "url"]],
+                height=300,
+                hide_index=True
+            )
+        st.divider()
 
     if df.empty:
         st.warning("불러온 뉴스가 없습니다. 잠시 후 다시 시도해 주세요.")
     else:
-        # TextRank 요약 + KeyBERT 키워드 생성
-        df["summary"] = df["summary_raw"].apply(lambda x: textrank_summarize(x, max_sent=3))
-        df["keywords"] = df["summary_raw"].apply(lambda x: extract_keywords(x, top_k=5))
 
-        # 언어 필터
-        st.subheader("🧩 필터")
-        lang_opt = st.selectbox("언어", ["전체", "한국어만", "영어만"])
+        df_page_base = df
 
-        df_page_base = df.copy()
-
-        if lang_opt == "한국어만":
-            df_page_base = df_page_base[df_page_base["lang"] == "ko"]
-        elif lang_opt == "영어만":
-            df_page_base = df_page_base[df_page_base["lang"] == "en"]
+        if lang_code:
+            df_page_base = df_page_base[df_page_base["lang"] == lang_code]
 
         # -------- Pagination (10개씩 출력) --------
         page_size = 10
@@ -899,6 +1845,13 @@ elif page == "📰 News":
             st.markdown(f"**Source:** {row['source']} · **언어:** {row['lang']}")
             st.markdown(f"**키워드:** {row['keywords']}")
             st.write(row["summary"])
+
+            if kw_model is not None:
+                related = related_articles(_news_uid(row), k=5)
+                if not related.empty:
+                    with st.expander("🔗 관련 기사"):
+                        for _, rel in related.iterrows():
+                            st.markdown(f"- {rel['title']} · *{rel['source']}* ({rel['similarity']:.2f})")
             st.divider()
 
         # WordCloud (요약 기반)
@@ -917,28 +1870,33 @@ elif page == "🧩 Sectors":
 
     st.title("🧩 Web3 섹터 분석 — 핵심 6개 그룹")
 
-    sectors_rt = load_sectors_realtime()
+    sectors_rt = load_sectors_or_report()
     if sectors_rt.empty:
         st.warning("섹터 데이터를 불러오지 못했습니다.")
     else:
         # 핵심 섹터별 시총/변화율 집계
-        core_summary = (
-            sectors_rt
-            .groupby("core_sector")
-            .agg(
-                total_mcap=("market_cap", "sum"),
-                avg_mcap_chg=("market_cap_change_24h", "mean")
-            )
-            .reset_index()
-        )
+        core_summary = summarize_core_sectors(sectors_rt)
 
-        # Infra/기타는 맨 아래로 보내기
-        core_summary["sort_key"] = core_summary["core_sector"].apply(
-            lambda x: 1 if x == "Infra/기타" else 0
-        )
-        core_summary = core_summary.sort_values(["sort_key", "core_sector"]).drop(columns=["sort_key"])
+        # 데이터 API 공개 (core_summary 는 매번 새로 집계되므로 원본 프레임 기준으로 버전 판단)
+        publish_dataset("sectors", sectors_rt)
+        publish_dataset("core_summary", core_summary, version=id(sectors_rt))
+
+        # 로테이션 히스토리용 스냅샷 저장 (5분에 1회)
+        if record_sector_snapshot(core_summary):
+            load_sector_rotation.clear()
 
         st.subheader("📊 핵심 섹터별 시총 & 24h 변화율")
+        render_card_grid(
+            [
+                summary_card(sector, f"${mcap:,.0f}", chg)
+                for sector, mcap, chg in zip(
+                    core_summary["core_sector"],
+                    core_summary["total_mcap"],
+                    core_summary["avg_mcap_chg"].fillna(0)
+                )
+            ],
+            columns=len(core_summary)
+        )
         st.dataframe(core_summary, height=300)
 
         # 변화율 바 차트
@@ -951,6 +1909,28 @@ elif page == "🧩 Sectors":
         )
         st.plotly_chart(fig_bar, use_container_width=True)
 
+        # 섹터 로테이션 (누적 스냅샷 기반)
+        st.subheader("🔄 섹터 로테이션 (점유율 & 롤링 수익률)")
+        rotation = load_sector_rotation(days=30)
+
+        if rotation["ts"].nunique() < 2:
+            st.info("스냅샷이 쌓이면 섹터 로테이션 차트가 표시됩니다.")
+        else:
+            fig_rot = px.area(
+                rotation,
+                x="date",
+                y="share",
+                color="core_sector",
+                labels={"date": "시점", "share": "점유율", "core_sector": "섹터"},
+            )
+            st.plotly_chart(fig_rot, use_container_width=True)
+
+            latest = rotation[rotation["ts"] == rotation["ts"].max()]
+            st.dataframe(
+                latest[["core_sector", "share", "ret_1d", "ret_7d", "ret_30d", "share_chg_7d"]],
+                hide_index=True
+            )
+
         st.subheader("📈 섹터별 Top Movers (코인 단위)")
 
         core_choices = core_summary["core_sector"].tolist()
@@ -958,32 +1938,54 @@ elif page == "🧩 Sectors":
 
         # 선택된 core 섹터에 속한 원시 카테고리들
         subset_cats = sectors_rt[sectors_rt["core_sector"] == chosen_core]
+        cat_ids = tuple(subset_cats["category_id"])
 
-        all_gainers = []
-        all_losers = []
-
-        for _, row in subset_cats.iterrows():
-            cat_id = row["category_id"]
-            top_g, top_l = load_sector_top_movers(cat_id, top=5)
-            if not top_g.empty:
-                top_g["category"] = row["sector"]
-                all_gainers.append(top_g)
-            if not top_l.empty:
-                top_l["category"] = row["sector"]
-                all_losers.append(top_l)
-
-        if all_gainers:
-            df_g = pd.concat(all_gainers, ignore_index=True)
-            df_g = df_g.sort_values("price_change_percentage_24h", ascending=False).head(10)
+        # 카테고리 인덱스 점진 갱신 (오래된 카테고리 일부만)
+        with st.spinner("카테고리 인덱스 갱신 중..."):
+            refresh_category_index(cat_ids)
+
+        covered, index_version = category_index_status(cat_ids)
+        if covered < len(cat_ids):
+            st.caption(f"카테고리 인덱스 수집 중: {covered}/{len(cat_ids)} (새로고침 시 이어서 수집)")
+
+        try:
+            df_g, df_l = load_sector_top_movers(cat_ids, top=10, index_version=index_version)
+        except Exception as e:
+            st.error(f"CoinGecko Markets API 오류: {e}")
+            df_g, df_l = pd.DataFrame(), pd.DataFrame()
+
+        if not df_g.empty:
             st.markdown("🔼 **상승 Top 10 코인**")
-            st.dataframe(df_g, height=300)
+            st.dataframe(df_g, height=300, hide_index=True)
         else:
             st.info("상승 코인 데이터를 가져오지 못했습니다.")
 
-        if all_losers:
-            df_l = pd.concat(all_losers, ignore_index=True)
-            df_l = df_l.sort_values("price_change_percentage_24h", ascending=True).head(10)
+        if not df_l.empty:
             st.markdown("🔽 **하락 Top 10 코인**")
-            st.dataframe(df_l, height=300)
+            st.dataframe(df_l, height=300, hide_index=True)
         else:
             st.info("하락 코인 데이터를 가져오지 못했습니다.")
+
+
+# ===============================================
+# SIDEBAR — 이상 징후 알림 (모든 페이지 공통)
+# ===============================================
+st.sidebar.subheader("🚨 이상 징후 알림")
+recent_alerts = get_alert_engine().recent_alerts(limit=5)
+
+if not recent_alerts:
+    st.sidebar.caption("감지된 이상 징후가 없습니다.")
+for alert in recent_alerts:
+    direction = "급등" if alert.z_ewma > 0 else "급락"
+    st.sidebar.warning(
+        f"**{_alert_label(alert.key)}** {direction}\n\n"
+        f"값 {alert.value:,.2f} · z={alert.z_ewma:+.1f} (장기 z={alert.z_welford:+.1f})\n\n"
+        f"{datetime.fromtimestamp(alert.ts):%m-%d %H:%M}"
+    )
+
+# 데이터 API 주소 (RADAR_DATA_API_PORT 설정 시)
+data_api = get_data_api()
+if data_api.url:
+    st.sidebar.caption(f"📡 Data API: {data_api.url}")
+elif data_api.error or DATA_API_PORT_ERROR:
+    st.sidebar.caption(f"📡 Data API 비활성: {data_api.error or DATA_API_PORT_ERROR}")